@@ -1,3 +1,8 @@
+import time
+# Startup timings in BabyClothesStoreApp.startup_times count from here, so
+# they include importing Kivy.
+LAUNCH_TIME = time.perf_counter()
+
 from kivy.app import App
 from kivy.core.window import Window
 from kivy.uix.boxlayout import BoxLayout
@@ -5,65 +10,225 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
-from kivy.uix.popup import Popup
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.screenmanager import ScreenManager, Screen, FadeTransition
-from kivy.uix.spinner import Spinner
 from kivy.metrics import dp
-from kivy.graphics import Color, RoundedRectangle
+from kivy.clock import Clock, mainthread
+from kivy.graphics import Color, InstructionGroup, Line, Rectangle, RoundedRectangle
+from kivy.core.text.markup import MarkupLabel as CoreMarkupLabel
+from kivy.properties import StringProperty
+from kivy.utils import escape_markup, get_hex_from_color
 from kivy.uix.widget import Widget
 from kivy.uix.behaviors import ButtonBehavior
-from kivy.uix.checkbox import CheckBox
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+# Popup, Spinner and CheckBox are imported inside the methods that build
+# forms, so none of them is loaded before the first popup opens. Check with
+# benchmarks/import_profile.py before adding Kivy imports up here.
 import sqlite3
 import datetime
 import os
+import csv
+import json
+import threading
+import queue
+import bisect
+import functools
+import itertools
+import math
+from collections import OrderedDict, deque, namedtuple
+from contextlib import contextmanager
+
+# --- Instrumentation ---
+# Set STORE_PROFILE=1 to time screen hooks, popup builders, database jobs
+# and SQL statements, and to add the Profiler screen. Without it, timed()
+# hands functions back untouched, so release builds pay nothing.
+PROFILE = os.environ.get('STORE_PROFILE') == '1'
+
+
+class Profiler:
+    """Ring buffers of recent timings per operation name, safe across threads."""
+    SAMPLES = 200  # Timings kept per operation for the percentiles
+    FRAMES = 240  # Frame times kept for the graph
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._samples = {}
+            self._counts = {}
+            self._queries = {}
+            self.frame_times = deque(maxlen=self.FRAMES)
+
+    @property
+    def queries(self):
+        """SQL statements run so far on the calling thread."""
+        return getattr(self._local, 'queries', 0)
+
+    def count_query(self):
+        self._local.queries = self.queries + 1
+
+    def record(self, name, seconds, queries=0):
+        with self._lock:
+            if name not in self._samples:
+                self._samples[name] = deque(maxlen=self.SAMPLES)
+                self._counts[name] = 0
+                self._queries[name] = 0
+            self._samples[name].append(seconds)
+            self._counts[name] += 1
+            self._queries[name] += queries
+
+    def record_frame(self, dt):
+        self.frame_times.append(dt)
+
+    def stats(self):
+        """[(name, calls, queries per call, p50 ms, p95 ms, max ms)], slowest p95 first."""
+        with self._lock:
+            snapshot = [(name, sorted(samples), self._counts[name], self._queries[name])
+                        for name, samples in self._samples.items()]
+        rows = [(name, count, queries / count, percentile(samples, 0.5) * 1000, percentile(samples, 0.95) * 1000,
+                 samples[-1] * 1000) for name, samples, count, queries in snapshot]
+        return sorted(rows, key=lambda row: row[4], reverse=True)
+
+    def report(self):
+        lines = [f"{'operation':<40} {'calls':>7} {'sql/call':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"]
+        lines += [f"{name:<40} {calls:>7} {queries:>8.1f} {p50:>8.2f} {p95:>8.2f} {worst:>8.2f}"
+                  for name, calls, queries, p50, p95, worst in self.stats()]
+        return '\n'.join(lines)
+
+
+profiler = Profiler()
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    return sorted_values[max(math.ceil(len(sorted_values) * fraction) - 1, 0)]
+
+
+def timed(name=None, query=False):
+    """Decorator recording each call's duration in profiler under name.
+
+    Also counts the SQL statements the call ran on its thread; query=True
+    marks the function as one such statement. A no-op unless PROFILE.
+    """
+    def decorate(func):
+        if not PROFILE:
+            return func
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if query:
+                profiler.count_query()
+            queries = profiler.queries
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(label, time.perf_counter() - start, profiler.queries - queries)
+        return wrapper
+    return decorate
+
+# --- Custom Widgets ---
+
+class TextureCache:
+    """Rendered markup textures, keyed by markup, wrap width and alignment.
+
+    Holds up to size textures, dropping the least recently used first.
+    """
+    def __init__(self, size):
+        self.size = size
+        self._textures = OrderedDict()
+
+    def get(self, markup, width=None, halign='left'):
+        """The texture of markup wrapped to width (None for no wrapping)."""
+        key = (markup, width, halign)
+        texture = self._textures.get(key)
+        if texture is not None:
+            self._textures.move_to_end(key)
+            return texture
+        # A fresh label each time: CoreLabel reuses its texture between
+        # refreshes, which would change textures already in the cache.
+        label = CoreMarkupLabel(text=markup, text_size=(width, None), halign=halign)
+        label.refresh()
+        texture = self._textures[key] = label.texture
+        if len(self._textures) > self.size:
+            self._textures.popitem(last=False)
+        return texture
+
+
+class ModernCard(Widget):
+    """A rounded card with a bold title over wrapped content text.
+
+    Title and content are drawn as one markup texture, rendered at most
+    once a frame and only when the text or the width changes; moving the
+    card just moves its two rectangles. Textures are cached by text and
+    width, so recycled rows and repeated resizes reuse earlier renders.
+    """
+    title = StringProperty('')
+    content = StringProperty('')
+
+    background_color = (0.95, 0.95, 0.95, 1)
+    radius = 15
+    text_padding = dp(15)
+    title_font = (dp(16), (0.2, 0.2, 0.2, 1))
+    content_font = (dp(14), (0.4, 0.4, 0.4, 1))
+    halign = 'left'
+    valign = 'top'
+
+    TEXTURE_CACHE_SIZE = 256  # A few screens' worth of cards
+    textures = TextureCache(TEXTURE_CACHE_SIZE)
 
-# --- Custom Widgets (No changes here) ---
-
-class ModernCard(BoxLayout):
     def __init__(self, title="", content="", **kwargs):
-        super().__init__(**kwargs)
-        self.orientation = 'vertical'
-        self.padding = dp(15)
-        self.spacing = dp(10)
-        self.size_hint_y = None
-        self.height = dp(120)
-        
+        kwargs.setdefault('size_hint_y', None)
+        kwargs.setdefault('height', dp(120))
+        super().__init__(title=title, content=content, **kwargs)
         with self.canvas.before:
-            Color(0.95, 0.95, 0.95, 1) 
-            self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[15])
-        
+            Color(*self.background_color)
+            self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[self.radius])
+            Color(1, 1, 1, 1)
+            self.text_rect = Rectangle(size=(0, 0))
+        self._render_trigger = Clock.create_trigger(self.render_text, -1)
+        self.bind(title=self._render_trigger, content=self._render_trigger, width=self._render_trigger)
         self.bind(pos=self.update_rect, size=self.update_rect)
-        
-        self.title_label = Label(
-            text=title,
-            font_size=dp(16),
-            bold=True,
-            color=(0.2, 0.2, 0.2, 1), 
-            size_hint_y=0.4,
-            text_size=(self.width - dp(30), None),
-            halign='left',
-            valign='top'
-        )
-        self.add_widget(self.title_label)
-        
-        self.content_label = Label(
-            text=content,
-            font_size=dp(14),
-            color=(0.4, 0.4, 0.4, 1),
-            size_hint_y=0.6,
-            text_size=(self.width - dp(30), None),
-            halign='left',
-            valign='top'
-        )
-        self.add_widget(self.content_label)
-    
+        self._render_trigger()
+
+    def markup(self):
+        """The card's text as Kivy markup."""
+        (title_size, title_color), (content_size, content_color) = self.title_font, self.content_font
+        text = f"[size={int(title_size)}][color={get_hex_from_color(title_color)}][b]{escape_markup(self.title)}[/b][/color][/size]"
+        if self.content:
+            text += f"\n[size={int(content_size)}][color={get_hex_from_color(content_color)}]{escape_markup(self.content)}[/color][/size]"
+        return text
+
+    def render_text(self, *args):
+        width = int(self.width - 2 * self.text_padding)
+        if width <= 0 or not (self.title or self.content):
+            self.text_rect.texture = None
+            self.text_rect.size = (0, 0)
+            return
+        texture = self.textures.get(self.markup(), width, self.halign)
+        self.text_rect.texture = texture
+        self.text_rect.size = texture.size
+        self.update_rect()
+
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-        # Update text_size for wrapping
-        self.title_label.text_size = (self.width - dp(30), None)
-        self.content_label.text_size = (self.width - dp(30), None)
+        text_width, text_height = self.text_rect.size
+        if self.halign == 'center':
+            x = self.center_x - text_width / 2
+        else:
+            x = self.x + self.text_padding
+        if self.valign == 'middle':
+            y = self.center_y - text_height / 2
+        else:
+            y = self.top - self.text_padding - text_height
+        self.text_rect.pos = (int(x), int(y))
 
 
 class ModernButton(Button):
@@ -85,25 +250,675 @@ class ModernTextInput(TextInput):
         self.height = dp(40)
         self.multiline = False
 
-# --- DATABASE MANAGER (No changes here) ---
+class SearchInput(ModernTextInput):
+    """A text box that dispatches on_search(text) once the user stops typing."""
+    __events__ = ('on_search',)
+    debounce = 0.25  # seconds
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._search_trigger = Clock.create_trigger(self._dispatch_search, self.debounce)
+        self.bind(text=self._restart_debounce)
+
+    def _restart_debounce(self, *args):
+        self._search_trigger.cancel()
+        self._search_trigger()
+
+    def _dispatch_search(self, dt):
+        self.dispatch('on_search', self.text.strip())
+
+    def on_search(self, text):
+        pass
+
+
+class PrefixIndex:
+    """Rows sorted by lower-cased label, for instant in-memory prefix lookups."""
+    def __init__(self, rows, label):
+        entries = sorted((label(row).lower(), row['id'], row) for row in rows)
+        self._keys = [(key, row_id) for key, row_id, _ in entries]
+        self._rows = [row for _, _, row in entries]
+
+    def match(self, prefix, limit):
+        prefix = prefix.lower()
+        matches = []
+        for i in range(bisect.bisect_left(self._keys, (prefix,)), len(self._keys)):
+            if len(matches) == limit or not self._keys[i][0].startswith(prefix):
+                break
+            matches.append(self._rows[i])
+        return matches
+
+
+class AutocompletePicker(BoxLayout):
+    """A type-ahead picker that only ever renders its top few matches.
+
+    Matches come from a PrefixIndex of hot rows as soon as a key is pressed,
+    then from search(text, limit), run through runner once typing pauses
+    with at least min_search_length characters. The chosen row is in
+    .selected.
+    """
+    __events__ = ('on_select',)
+    max_matches = 4
+    min_search_length = 2  # A single letter is left to the hot rows
+
+    def __init__(self, runner, search, label, hint_text='', row_filter=None, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.size_hint_y = None
+        self.runner = runner
+        self.search = search
+        self.label = label
+        self.row_filter = row_filter or (lambda row: True)
+        self.hot_index = PrefixIndex([], label)
+        self.selected = None
+        self._setting_text = False
+
+        self.text_input = SearchInput(hint_text=hint_text)
+        self.text_input.bind(text=self._on_text, on_search=self._on_search)
+        self.add_widget(self.text_input)
+        # A fixed pool of suggestion buttons, shown or collapsed as needed.
+        self.match_buttons = []
+        for _ in range(self.max_matches):
+            button = Button(size_hint_y=None, height=0, opacity=0, background_normal='',
+                            background_color=(0.93, 0.93, 0.93, 1), color=(0.2, 0.2, 0.2, 1))
+            button.row = None
+            button.bind(on_press=self._on_match_pressed)
+            self.match_buttons.append(button)
+            self.add_widget(button)
+        self._resize()
+
+    def set_hot_rows(self, rows):
+        self.hot_index = PrefixIndex([row for row in rows if self.row_filter(row)], self.label)
+
+    def reset(self):
+        self.selected = None
+        self._set_text('')
+        self._show_matches([])
+
+    def _on_text(self, text_input, text):
+        if self._setting_text:
+            return
+        self.selected = None
+        self._show_matches(self.hot_index.match(text.strip(), self.max_matches) if text.strip() else [])
+
+    def _on_search(self, text_input, text):
+        if self._setting_text or len(text) < self.min_search_length:
+            return
+        self.runner(self.search, text, self.max_matches * 2,
+                    callback=lambda rows: self._merge_matches(text, rows))
+
+    def _merge_matches(self, text, rows):
+        if text != self.text_input.text.strip() or self.selected is not None:
+            return  # The user has moved on since this search was sent.
+        matches = self.hot_index.match(text, self.max_matches)
+        seen = {row['id'] for row in matches}
+        matches += [row for row in rows if row['id'] not in seen and self.row_filter(row)]
+        self._show_matches(matches[:self.max_matches])
+
+    def _show_matches(self, rows):
+        for i, button in enumerate(self.match_buttons):
+            button.row = rows[i] if i < len(rows) else None
+            button.text = self.label(button.row) if button.row else ''
+            button.height = dp(36) if button.row else 0
+            button.opacity = 1 if button.row else 0
+            button.disabled = button.row is None
+        self._resize()
+
+    def _resize(self):
+        self.height = self.text_input.height + sum(button.height for button in self.match_buttons)
+
+    def _on_match_pressed(self, button):
+        if button.row is None:
+            return
+        self.selected = button.row
+        self._set_text(self.label(button.row))
+        self._show_matches([])
+        self.dispatch('on_select', button.row)
+
+    def _set_text(self, text):
+        self._setting_text = True
+        self.text_input.text = text
+        self.text_input._search_trigger.cancel()
+        self._setting_text = False
+
+    def on_select(self, row):
+        pass
+
+# --- Recycled Lists ---
+
+class RecordCard(RecycleDataViewBehavior, ModernCard):
+    """ModernCard as a RecycleView view class, fed {'title': ..., 'content': ...}."""
+
+
+class PagedList(BoxLayout):
+    """A recycled list that pulls its rows from the database a page at a time.
+
+    Only rows near the viewport get a view widget; the next page is fetched
+    when the user scrolls close to the end of what is loaded. Loaded rows are
+    keyed by key(row) and kept in sort_key(row) order, so single rows can be
+    upserted or removed without reloading the list. Pages are fetched through
+    runner (DatabaseManager.run_async) so scrolling never waits on disk.
+    """
+    page_size = 50
+    prefetch_threshold = 0.2  # scroll_y runs from 1 at the top to 0 at the bottom
+
+    def __init__(self, viewclass, row_height, runner, sort_key, key=lambda row: row['id'], empty_text='', **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.runner = runner
+        self.sort_key = sort_key
+        self.key = key
+        self.empty_text = empty_text
+        self._rows = {}
+        self.page_loader = None
+        self.row_to_data = None
+        self._next_key = None
+        self._has_more = False
+        self._loading = False
+        self._generation = 0
+        self._scroll_anchor = None
+
+        self.status_label = Label(text='', color=(0.5, 0.5, 0.5, 1), size_hint_y=None, height=0)
+        self.add_widget(self.status_label)
+
+        self.view = RecycleView()
+        self.layout = RecycleBoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None,
+                                       default_size=(None, row_height), default_size_hint=(1, None))
+        self.layout.bind(minimum_height=self.layout.setter('height'))
+        self.layout.bind(height=self._keep_scroll_position)
+        self.view.add_widget(self.layout)
+        self.view.viewclass = viewclass
+        self.view.bind(scroll_y=self._on_scroll)
+        self.add_widget(self.view)
+
+    @property
+    def data(self):
+        return self.view.data
+
+    def load(self, page_loader, row_to_data):
+        """Show the first page of page_loader(after_key, limit), dropping what was loaded."""
+        self.page_loader = page_loader
+        self.row_to_data = row_to_data
+        self._next_key = None
+        self._has_more = True
+        self._loading = False
+        self._generation += 1
+        self._scroll_anchor = None
+        self._rows = {}
+        self.view.data = []
+        self.view.scroll_y = 1
+        self.set_status('Loading...')
+        self.load_more()
+
+    @property
+    def loading(self):
+        return self._loading
+
+    def load_more(self):
+        if not self._has_more or self._loading:
+            return
+        self._loading = True
+        generation = self._generation
+        self.runner(self.page_loader, self._next_key, self.page_size,
+                    callback=lambda page: self._on_page(generation, page))
+
+    def _on_page(self, generation, page):
+        if generation != self._generation:
+            return  # A newer load() replaced the one that asked for this page.
+        rows, self._next_key = page
+        self._loading = False
+        self._has_more = self._next_key is not None
+        # Rows upserted while the page was in flight are already newer.
+        rows = [row for row in rows if self.key(row) not in self._rows]
+        if self.view.data:
+            # Remember how far down we are so appending rows doesn't move the viewport.
+            self._scroll_anchor = (1 - self.view.scroll_y) * max(self.layout.height - self.view.height, 0)
+        self._rows.update((self.key(row), row) for row in rows)
+        self.view.data.extend(self._to_data(row) for row in rows)
+        self.set_status('' if self.view.data else self.empty_text)
+
+    def upsert(self, row):
+        """Add row, or replace the loaded row with the same key, in sort order."""
+        self.remove(self.key(row))
+        sort_key = self.sort_key(row)
+        if self._has_more and (not self.view.data or sort_key > self.sort_key(self.view.data[-1]['row'])):
+            return  # Belongs to a page that hasn't been loaded yet.
+        index = bisect.bisect(self.view.data, sort_key, key=lambda item: self.sort_key(item['row']))
+        self._rows[self.key(row)] = row
+        self.view.data.insert(index, self._to_data(row))
+        self.set_status('')
+
+    def remove(self, key):
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        index = bisect.bisect_left(self.view.data, self.sort_key(row), key=lambda item: self.sort_key(item['row']))
+        del self.view.data[index]
+        if not self.view.data:
+            self.set_status(self.empty_text)
+
+    def _to_data(self, row):
+        data = self.row_to_data(row)
+        data['row'] = row
+        return data
+
+    def set_status(self, text):
+        self.status_label.text = text
+        self.status_label.height = dp(40) if text else 0
+
+    def _on_scroll(self, view, scroll_y):
+        if scroll_y <= self.prefetch_threshold:
+            self.load_more()
+
+    def _keep_scroll_position(self, layout, height):
+        if self._scroll_anchor is None:
+            return
+        scrollable = height - self.view.height
+        if scrollable > 0:
+            self.view.scroll_y = 1 - min(self._scroll_anchor / scrollable, 1)
+        self._scroll_anchor = None
+
+# --- Database Manager ---
+
+# Timing and outcome of one customer totals reconciliation pass. high_water
+# is the last sale id covered, or None for a full pass.
+ReconcileStats = namedtuple('ReconcileStats', 'mode customers_checked corrected high_water seconds')
+
+# Published by DatabaseManager after every committed write. action is
+# 'insert', 'update' or 'delete'; row_id is None when a bulk operation
+# touched many rows. version increases by one with every event.
+ChangeEvent = namedtuple('ChangeEvent', 'table action row_id version')
+
+# One statement seen by SQL tracing. params is the shape of the bound values
+# (their type names), never the values, so customer data stays out of logs.
+# vm_steps counts thousands of SQLite VM instructions; a large count on a
+# small result usually means a table scan. plan is the EXPLAIN QUERY PLAN
+# detail lines, captured for slow statements only.
+QueryTrace = namedtuple('QueryTrace', 'sql params ms rows vm_steps plan')
+
+# Set STORE_SLOW_QUERY_MS to trace every statement and report those at least
+# that slow. Unset, DatabaseManager runs statements without any tracing.
+SLOW_QUERY_MS = float(os.environ['STORE_SLOW_QUERY_MS']) if os.environ.get('STORE_SLOW_QUERY_MS') else None
+
+
+class TracedCursor:
+    """A cursor whose rows were fetched up front, so tracing could time and count them."""
+    def __init__(self, cursor, rows):
+        self._cursor = cursor
+        self._rows = iter(rows)
+
+    def fetchone(self):
+        return next(self._rows, None)
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def __iter__(self):
+        return self._rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)  # description, rowcount, lastrowid
+
+
+class OutOfStockError(Exception):
+    """Raised by DatabaseManager.checkout when a line can't be covered by stock."""
+    def __init__(self, product_id, product_name, requested):
+        super().__init__(f"Not enough stock of {product_name} for {requested}.")
+        self.product_id = product_id
+        self.product_name = product_name
+        self.requested = requested
+
+
+# Formats accepted for a typed-in sale date, tried in order. Day-first wins
+# over month-first for slashed dates, as written on the shop's receipts.
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y')
+
+
+def iso_date(text):
+    """Return text as a YYYY-MM-DD string, or raise ValueError."""
+    text = text.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognised date {text!r}, use YYYY-MM-DD")
+
+
+class DatabaseWorker:
+    """Runs database calls on one background thread, in submission order.
+
+    Results and errors are handed back to the Kivy main loop through Clock,
+    so callbacks may touch widgets. The thread gets its own connection from
+    DatabaseManager the first time it runs a query.
+    """
+    def __init__(self, name='database-worker'):
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args, callback=None, error_callback=None):
+        if PROFILE:
+            func = self._timed_job(func)
+        self._jobs.put((func, args, callback, error_callback))
+
+    @staticmethod
+    def _timed_job(func):
+        # Time spent waiting in the queue, then running, under the job's name.
+        queued = time.perf_counter()
+        run = timed(f"db.{getattr(func, '__name__', 'job')}")(func)
+
+        def job(*args):
+            profiler.record('worker.queue_wait', time.perf_counter() - queued)
+            return run(*args)
+        return job
+
+    def stop(self):
+        """Finish the jobs already queued, then end the thread."""
+        self._jobs.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            func, args, callback, error_callback = job
+            try:
+                result = func(*args)
+            except Exception as e:
+                if error_callback is not None:
+                    Clock.schedule_once(lambda dt, error_callback=error_callback, e=e: error_callback(e))
+                else:
+                    print(f"Database call failed: {e}")
+                continue
+            if callback is not None:
+                Clock.schedule_once(lambda dt, callback=callback, result=result: callback(result))
+
+
 class DatabaseManager:
-    def __init__(self, db_name='store.db'):
+    # Pragmas applied to every connection we open. WAL lets readers keep going
+    # while a write is committing, and NORMAL sync is safe in WAL mode.
+    PRAGMAS = (
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA cache_size=-8000',
+        'PRAGMA foreign_keys=ON',
+    )
+    STATEMENT_CACHE_SIZE = 256
+    PAGE_SIZE = 50
+    # Schema migrations applied on top of create_tables, oldest first. The
+    # number already applied is stored in PRAGMA user_version, so only append.
+    MIGRATIONS = (
+        '_migrate_add_indexes',
+        '_migrate_sales_foreign_keys',
+        '_migrate_full_text_search',
+        '_migrate_orders',
+        '_migrate_sales_daily',
+        '_migrate_customer_reconciliation',
+        '_migrate_reorder_points',
+        '_migrate_order_foreign_key_indexes',
+        '_migrate_sales_daily_category_index',
+    )
+    # Columns mirrored into the FTS5 search indexes, per table.
+    SEARCH_COLUMNS = {
+        'products': ('name', 'category', 'supplier', 'color', 'material'),
+        'customers': ('name', 'email', 'phone', 'baby_name'),
+    }
+    SEARCH_LIMIT = 50
+    SHORT_SEARCH = 3  # Up to this many characters, a search only matches the start of the name
+    SEARCH_CANDIDATES = 1000  # FTS matches ranked per search; more are not looked at
+    # Reorder point for products whose category has none set. Baked into the
+    # reorder triggers, so changing it takes a migration.
+    DEFAULT_REORDER_POINT = 5
+    TRACE_LOG_SIZE = 500  # Statements kept in query_log and slow_queries
+    PROGRESS_STEPS = 1000  # VM instructions per progress handler call while tracing
+
+    def __init__(self, db_name='store.db', slow_query_ms=SLOW_QUERY_MS, setup=True):
+        """Open db_name. With setup=False the schema checks and seeding wait
+        for setup_async(), and run_async jobs are held until then."""
         self.db_name = db_name
-        self.conn = sqlite3.connect(self.db_name)
+        self.slow_query_ms = slow_query_ms
+        self.query_log = deque(maxlen=self.TRACE_LOG_SIZE)
+        self.slow_queries = deque(maxlen=self.TRACE_LOG_SIZE)
+        if slow_query_ms is not None:
+            # Swap in the tracing versions; with tracing off the plain
+            # methods run with nothing in between.
+            self._execute = self._traced_execute
+            self._executemany = self._traced_executemany
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._worker = None
+        self._subscribers = []
+        self._version_lock = threading.Lock()
+        self.data_version = 0
+        self.last_reconcile = {}
+        self._verify_thread = None
+        self._verify_stop = threading.Event()
+        self.has_fts = False
+        self._held_jobs = []
+        if setup:
+            self.setup()
+            self._held_jobs = None
+
+    def setup(self):
+        """Create and migrate the schema, then seed an empty store."""
         self.create_tables()
+        self.migrate()
+        self.has_fts = self._table_exists('products_fts')
         self.init_sample_data()
 
+    def setup_async(self, callback=None, error_callback=None):
+        """Run setup on the worker, ahead of any jobs held until now."""
+        held, self._held_jobs = self._held_jobs, None
+        self.run_async(self.setup, callback=callback, error_callback=error_callback)
+        for func, args, kwargs in held or ():
+            self.run_async(func, *args, **kwargs)
+
+    @property
+    def conn(self):
+        """The long-lived connection owned by the calling thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _connect(self):
+        # isolation_level=None puts the connection in autocommit mode, so
+        # BEGIN/COMMIT issued through _execute are real transactions.
+        conn = sqlite3.connect(self.db_name, isolation_level=None, check_same_thread=False,
+                               cached_statements=self.STATEMENT_CACHE_SIZE)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        if self.slow_query_ms is not None:
+            conn.set_progress_handler(self._count_vm_steps, self.PROGRESS_STEPS)
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def run_async(self, func, *args, callback=None, error_callback=None):
+        """Run func(*args) on the database worker thread.
+
+        callback(result) or error_callback(exception) is called on the Kivy
+        main thread once it is done.
+        """
+        if self._held_jobs is not None:
+            self._held_jobs.append((func, args, {'callback': callback, 'error_callback': error_callback}))
+            return
+        if self._worker is None:
+            self._worker = DatabaseWorker()
+        self._worker.submit(func, *args, callback=callback, error_callback=error_callback)
+
+    def close(self):
+        if self._verify_thread is not None:
+            self._verify_stop.set()
+            self._verify_thread.join()
+            self._verify_thread = None
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    @timed('sql.execute', query=True)
     def _execute(self, query, params=()):
-        with sqlite3.connect(self.db_name) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor
+        return self.conn.execute(query, params)
+
+    @timed('sql.executemany', query=True)
+    def _executemany(self, query, seq_of_params):
+        return self.conn.executemany(query, seq_of_params)
+
+    # --- SQL tracing ---
+    # Enabled by a slow_query_ms threshold. Statement text and timings come
+    # from _execute rather than sqlite3's trace callback, which expands the
+    # bound values into the text.
+
+    def _count_vm_steps(self):
+        self._local.vm_steps = getattr(self._local, 'vm_steps', 0) + 1
+        return 0  # Non-zero would abort the statement.
+
+    @staticmethod
+    def _params_shape(params):
+        if isinstance(params, dict):
+            return {key: type(value).__name__ for key, value in params.items()}
+        return tuple(type(value).__name__ for value in params)
+
+    @timed('sql.execute', query=True)
+    def _traced_execute(self, query, params=()):
+        return self._trace(lambda: self.conn.execute(query, params), query, params, self._params_shape(params))
+
+    @timed('sql.executemany', query=True)
+    def _traced_executemany(self, query, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        first = seq_of_params[0] if seq_of_params else ()
+        shape = f"{len(seq_of_params)} x {self._params_shape(first)}"
+        return self._trace(lambda: self.conn.executemany(query, seq_of_params), query, first, shape)
+
+    def _trace(self, run, query, params, shape):
+        self._local.vm_steps = 0
+        start = time.perf_counter()
+        cursor = run()
+        rows = cursor.fetchall() if cursor.description is not None else None
+        ms = (time.perf_counter() - start) * 1000
+        vm_steps = self._local.vm_steps
+        slow = ms >= self.slow_query_ms
+        trace = QueryTrace(' '.join(query.split()), shape, ms, len(rows) if rows is not None else cursor.rowcount,
+                           vm_steps, self._explain(query, params) if slow else None)
+        self.query_log.append(trace)
+        if slow:
+            self.slow_queries.append(trace)
+            self._report_slow_query(trace)
+        return cursor if rows is None else TracedCursor(cursor, rows)
+
+    def _explain(self, query, params):
+        if query.split(None, 1)[0].upper() not in ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE'):
+            return []
+        try:
+            return [row[3] for row in self.conn.execute('EXPLAIN QUERY PLAN ' + query, params)]
+        except sqlite3.Error:
+            return []
+
+    @staticmethod
+    def _report_slow_query(trace):
+        print(f"Slow query: {trace.ms:.1f} ms, {trace.rows} rows, {trace.vm_steps}k VM steps, params {trace.params}\n"
+              f"    {trace.sql}")
+        for line in trace.plan:
+            # A SCAN that doesn't name an index reads the whole table.
+            marker = '  <-- full table scan' if line.startswith('SCAN') and 'INDEX' not in line else ''
+            print(f"    plan: {line}{marker}")
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed statements as one transaction.
+
+        Nested blocks join the outermost transaction, which commits when it
+        exits cleanly and rolls back if any block raises.
+        """
+        depth = getattr(self._local, 'depth', 0)
+        if depth == 0:
+            # IMMEDIATE takes the write lock up front, so a transaction that
+            # reads stock and then updates it can't interleave with another.
+            self._execute('BEGIN IMMEDIATE')
+            self._local.pending_events = []
+        self._local.depth = depth + 1
+        try:
+            yield self.conn
+        except BaseException:
+            self._local.depth = depth
+            if depth == 0:
+                self._local.pending_events = []
+                self._execute('ROLLBACK')
+            raise
+        self._local.depth = depth
+        if depth == 0:
+            self._execute('COMMIT')
+            pending, self._local.pending_events = self._local.pending_events, []
+            for table, action, row_id in pending:
+                self._publish(table, action, row_id)
+
+    @property
+    def in_transaction(self):
+        return getattr(self._local, 'depth', 0) > 0
+
+    def subscribe(self, callback):
+        """Call callback(event) with a ChangeEvent after each committed write.
+
+        Callbacks run on the thread that made the write.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def notify_bulk_change(self, table, action='insert'):
+        """Tell subscribers table changed as a whole, after writes made
+        outside the mutators above (e.g. a file import)."""
+        self._notify(table, action)
+
+    def _notify(self, table, action, row_id=None):
+        # Inside a transaction, hold events back until it commits.
+        if self.in_transaction:
+            self._local.pending_events.append((table, action, row_id))
+        else:
+            self._publish(table, action, row_id)
+
+    def _publish(self, table, action, row_id):
+        with self._version_lock:
+            self.data_version += 1
+            event = ChangeEvent(table, action, row_id, self.data_version)
+        for callback in list(self._subscribers):
+            callback(event)
 
     def _rows_to_dicts(self, cursor, rows):
         columns = [description[0] for description in cursor.description]
         return [dict(zip(columns, row)) for row in rows]
 
+    def _keyset_page(self, first_query, after_query, after_key, limit, key):
+        """Fetch one page of rows and the key to pass for the next page.
+
+        The next key is None once the last page has been returned.
+        """
+        if after_key is None:
+            cursor = self._execute(first_query, (limit,))
+        else:
+            cursor = self._execute(after_query, (*after_key, limit))
+        rows = self._rows_to_dicts(cursor, cursor.fetchall())
+        next_key = key(rows[-1]) if len(rows) == limit else None
+        return rows, next_key
+
+    def _iter_pages(self, get_page, batch_size):
+        after_key = None
+        while True:
+            rows, after_key = get_page(after_key, batch_size)
+            yield from rows
+            if after_key is None:
+                return
+
     def create_tables(self):
         self._execute('''
             CREATE TABLE IF NOT EXISTS products (
@@ -118,6 +933,203 @@ class DatabaseManager:
                 id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, customer_name TEXT, product_name TEXT,
                 quantity INTEGER, total REAL, size TEXT)''')
 
+    @property
+    def schema_version(self):
+        return self._execute('PRAGMA user_version').fetchone()[0]
+
+    def migrate(self):
+        """Apply any pending MIGRATIONS, each in its own transaction."""
+        version = self.schema_version
+        for number, name in enumerate(self.MIGRATIONS[version:], start=version + 1):
+            with self.transaction():
+                getattr(self, name)()
+                self._execute(f'PRAGMA user_version = {number}')
+
+    def _migrate_add_indexes(self):
+        self._execute('CREATE INDEX IF NOT EXISTS idx_products_name ON products(name)')
+        self._execute('CREATE INDEX IF NOT EXISTS idx_products_stock ON products(stock)')
+        self._execute('CREATE INDEX IF NOT EXISTS idx_customers_name ON customers(name)')
+        self._execute('CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(date)')
+
+    def _migrate_sales_foreign_keys(self):
+        # Sales keep the name columns as a snapshot of what was sold, and gain
+        # ids for joins. Existing rows are matched up by name.
+        self._execute('ALTER TABLE sales ADD COLUMN product_id INTEGER REFERENCES products(id) ON DELETE SET NULL')
+        self._execute('ALTER TABLE sales ADD COLUMN customer_id INTEGER REFERENCES customers(id) ON DELETE SET NULL')
+        self._execute('UPDATE sales SET product_id = (SELECT MIN(id) FROM products WHERE products.name = sales.product_name)')
+        self._execute('UPDATE sales SET customer_id = (SELECT MIN(id) FROM customers WHERE customers.name = sales.customer_name)')
+        self._execute('CREATE INDEX IF NOT EXISTS idx_sales_product_id ON sales(product_id)')
+        self._execute('CREATE INDEX IF NOT EXISTS idx_sales_customer_id ON sales(customer_id)')
+
+    def _migrate_full_text_search(self):
+        # Some SQLite builds ship without FTS5; search then falls back to a
+        # LIKE prefix match on the name column.
+        try:
+            self._execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)')
+            self._execute('DROP TABLE temp.fts5_probe')
+        except sqlite3.OperationalError:
+            return
+        for table, columns in self.SEARCH_COLUMNS.items():
+            fts = f'{table}_fts'
+            column_list = ', '.join(columns)
+            new_values = ', '.join(f'new.{c}' for c in columns)
+            old_values = ', '.join(f'old.{c}' for c in columns)
+            self._execute(f"""CREATE VIRTUAL TABLE {fts} USING fts5({column_list}, content='{table}', content_rowid='id',
+                              tokenize='unicode61 remove_diacritics 2', prefix='2 3')""")
+            self._execute(f"""CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN
+                                  INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+                              END""")
+            self._execute(f"""CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN
+                                  INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                              END""")
+            self._execute(f"""CREATE TRIGGER {fts}_update AFTER UPDATE OF {column_list} ON {table} BEGIN
+                                  INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                                  INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+                              END""")
+            self._execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def _migrate_orders(self):
+        # An order is one checkout of a basket. Each line is also written to
+        # sales, which stays the per-product ledger the screens report on.
+        self._execute('''
+            CREATE TABLE orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL,
+                customer_id INTEGER REFERENCES customers(id) ON DELETE SET NULL, customer_name TEXT, total REAL NOT NULL)''')
+        self._execute('''
+            CREATE TABLE order_lines (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, order_id INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+                product_id INTEGER REFERENCES products(id) ON DELETE SET NULL, product_name TEXT, size TEXT,
+                quantity INTEGER NOT NULL, unit_price REAL NOT NULL, total REAL NOT NULL)''')
+        self._execute('CREATE INDEX idx_order_lines_order_id ON order_lines(order_id)')
+        self._execute('ALTER TABLE sales ADD COLUMN order_id INTEGER REFERENCES orders(id) ON DELETE SET NULL')
+
+    def _migrate_sales_daily(self):
+        # sales.date is whatever was typed; sale_date is the same day in ISO
+        # form, NULL where the old text can't be parsed. sales_daily is the
+        # rollup reports read, kept current by _roll_up_sales on every insert.
+        self._execute('ALTER TABLE sales ADD COLUMN sale_date TEXT')
+        updates = []
+        for sale_id, date in self._execute('SELECT id, date FROM sales').fetchall():
+            try:
+                updates.append((iso_date(date), sale_id))
+            except ValueError:
+                pass
+        self._executemany('UPDATE sales SET sale_date = ? WHERE id = ?', updates)
+        self._execute('CREATE INDEX idx_sales_sale_date ON sales(sale_date)')
+        self._execute('''
+            CREATE TABLE sales_daily (
+                day TEXT NOT NULL, product_id INTEGER NOT NULL, category TEXT NOT NULL,
+                quantity INTEGER NOT NULL, revenue REAL NOT NULL, sale_count INTEGER NOT NULL,
+                PRIMARY KEY (day, product_id, category)) WITHOUT ROWID''')
+        self.rebuild_sales_daily()
+
+    def _migrate_customer_reconciliation(self):
+        # app_state holds small named values, such as the reconciliation
+        # high-water mark. The triggers remember customers whose sales were
+        # changed or removed, which the high-water mark alone would miss.
+        self._execute('CREATE TABLE app_state (key TEXT PRIMARY KEY, value)')
+        self._execute('CREATE TABLE customer_totals_dirty (customer_id INTEGER PRIMARY KEY)')
+        self._execute('''CREATE TRIGGER sales_delete_dirty AFTER DELETE ON sales WHEN old.customer_id IS NOT NULL BEGIN
+                             INSERT OR IGNORE INTO customer_totals_dirty VALUES (old.customer_id);
+                         END''')
+        self._execute('''CREATE TRIGGER sales_update_dirty AFTER UPDATE OF total, customer_id ON sales BEGIN
+                             INSERT OR IGNORE INTO customer_totals_dirty SELECT old.customer_id WHERE old.customer_id IS NOT NULL;
+                             INSERT OR IGNORE INTO customer_totals_dirty SELECT new.customer_id WHERE new.customer_id IS NOT NULL;
+                         END''')
+
+    def _migrate_reorder_points(self):
+        self._execute('ALTER TABLE products ADD COLUMN own_reorder_point INTEGER')
+        self._execute(f'ALTER TABLE products ADD COLUMN reorder_point INTEGER NOT NULL DEFAULT {self.DEFAULT_REORDER_POINT}')
+        self._execute('CREATE TABLE category_reorder_points (category TEXT PRIMARY KEY, reorder_point INTEGER NOT NULL)')
+        # Correlated on the products row being updated, so one expression
+        # serves every trigger below.
+        effective = f'''COALESCE(own_reorder_point,
+                                 (SELECT reorder_point FROM category_reorder_points r WHERE r.category = products.category),
+                                 {self.DEFAULT_REORDER_POINT})'''
+        # New rows already hold the default from the column definition.
+        self._execute(f"""CREATE TRIGGER products_reorder_insert AFTER INSERT ON products
+                          WHEN new.own_reorder_point IS NOT NULL
+                               OR EXISTS (SELECT 1 FROM category_reorder_points WHERE category = new.category) BEGIN
+                              UPDATE products SET reorder_point = {effective} WHERE id = new.id;
+                          END""")
+        self._execute(f"""CREATE TRIGGER products_reorder_update AFTER UPDATE OF category, own_reorder_point ON products BEGIN
+                              UPDATE products SET reorder_point = {effective} WHERE id = new.id;
+                          END""")
+        for action, row in (('INSERT', 'new'), ('UPDATE', 'new'), ('DELETE', 'old')):
+            self._execute(f"""CREATE TRIGGER category_reorder_{action.lower()} AFTER {action} ON category_reorder_points BEGIN
+                                  UPDATE products SET reorder_point = {effective}
+                                  WHERE category = {row}.category AND own_reorder_point IS NULL;
+                              END""")
+        self._execute(f'UPDATE products SET reorder_point = {effective}')
+        self._execute('CREATE INDEX idx_products_reorder ON products(stock, name) WHERE stock <= reorder_point')
+
+    def _migrate_order_foreign_key_indexes(self):
+        # Deleting a product or customer sets these columns to NULL, which
+        # scanned the whole table without an index.
+        self._execute('CREATE INDEX idx_order_lines_product_id ON order_lines(product_id)')
+        self._execute('CREATE INDEX idx_orders_customer_id ON orders(customer_id)')
+
+    def _migrate_sales_daily_category_index(self):
+        # Covers the all-time revenue by category report, which otherwise
+        # sorts every rollup row into a temporary b-tree.
+        self._execute('CREATE INDEX idx_sales_daily_category ON sales_daily(category, revenue, quantity)')
+
+    def _table_exists(self, name):
+        return self._execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+    @staticmethod
+    def _fts_prefix_query(text):
+        """Turn what the user typed into an FTS5 query matching every word as a prefix."""
+        words = text.replace('"', ' ').split()
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def _search_name_prefix(self, table, prefix, limit):
+        # One idx_*_name range per upper/lower-case spelling of prefix, each
+        # already in name order, so only their first rows are sorted.
+        spellings = sorted({''.join(chars) for chars in itertools.product(*((c.lower(), c.upper()) for c in prefix))})
+        ranges = ' UNION ALL '.join(f'SELECT * FROM (SELECT * FROM {table} WHERE name >= ? AND name < ? ORDER BY name, id LIMIT ?)'
+                                    for _ in spellings)
+        params = [value for spelling in spellings for value in (spelling, spelling[:-1] + chr(ord(spelling[-1]) + 1), limit)]
+        return self._execute(f'{ranges} ORDER BY name, id LIMIT ?', (*params, limit))
+
+    def _search(self, table, text, limit):
+        if not self._fts_prefix_query(text):
+            return []
+        text = text.strip()
+        if len(text) <= self.SHORT_SEARCH and ' ' not in text:
+            # A prefix this short matches most rows, and ranking them all
+            # with bm25 takes hundreds of milliseconds in a large store.
+            cursor = self._search_name_prefix(table, text, limit)
+        elif self.has_fts:
+            # bm25 weights: a hit in the name counts most. Only the first
+            # SEARCH_CANDIDATES matches are scored, so a vague query costs
+            # no more than a specific one.
+            weights = ', '.join(['10.0'] + ['1.0'] * (len(self.SEARCH_COLUMNS[table]) - 1))
+            cursor = self._execute(f"""
+                SELECT {table}.* FROM (
+                    SELECT rowid, bm25({table}_fts, {weights}) AS score FROM {table}_fts WHERE {table}_fts MATCH ? LIMIT ?
+                ) matches JOIN {table} ON {table}.id = matches.rowid ORDER BY matches.score LIMIT ?""",
+                (self._fts_prefix_query(text), self.SEARCH_CANDIDATES, limit))
+        else:
+            pattern = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            cursor = self._execute(f"SELECT * FROM {table} WHERE name LIKE ? ESCAPE '\\' ORDER BY name, id LIMIT ?",
+                                   (pattern, limit))
+        return self._rows_to_dicts(cursor, cursor.fetchall())
+
+    def search_products(self, text, limit=SEARCH_LIMIT):
+        """Products matching every word of text as a prefix, best match first.
+
+        Up to SHORT_SEARCH characters, only names starting with text match.
+        """
+        return self._search('products', text, limit)
+
+    def search_customers(self, text, limit=SEARCH_LIMIT):
+        """Customers matching every word of text as a prefix, best match first.
+
+        Up to SHORT_SEARCH characters, only names starting with text match.
+        """
+        return self._search('customers', text, limit)
+
     def init_sample_data(self):
         cursor = self._execute('SELECT COUNT(*) FROM products')
         if cursor.fetchone()[0] == 0:
@@ -127,124 +1139,1167 @@ class DatabaseManager:
                 ("Newborn Romper", "Outerwear", 32.99, 12, "Little Angels", "Newborn", "Newborn", "Yellow", "Bamboo", "Gently Used"),
                 ("Baby Footie Pajamas", "Sleepwear", 22.99, 4, "Cozy Dreams", "6-9M", "6-9M", "White", "Cotton Blend", "New"),
             ]
-            self._execute('BEGIN TRANSACTION')
-            for p in products:
-                self._execute('INSERT INTO products (name, category, price, stock, supplier, size, age_range, color, material, condition) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', p)
-            self._execute('COMMIT')
+            onesie_id, gown_id, _, _ = self.bulk_add_products(products)
 
             customers = [
-                ("Emma Johnson", "emma.j@email.com", "123-456-7890", 39.99, "Lily", "3 months"),
-                ("Sarah Williams", "sarah.w@email.com", "098-765-4321", 99.97, "Max", "8 months"),
+                ("Emma Johnson", "emma.j@email.com", "123-456-7890", 0, "Lily", "3 months"),
+                ("Sarah Williams", "sarah.w@email.com", "098-765-4321", 0, "Max", "8 months"),
             ]
-            self._execute('BEGIN TRANSACTION')
-            for c in customers:
-                self._execute('INSERT INTO customers (name, email, phone, total_purchases, baby_name, baby_age) VALUES (?, ?, ?, ?, ?, ?)', c)
-            self._execute('COMMIT')
-            
-            all_products = self.get_all_products()
-            all_customers = self.get_all_customers()
-            emma = next(c for c in all_customers if c['name'] == "Emma Johnson")
-            sarah = next(c for c in all_customers if c['name'] == "Sarah Williams")
-            onesie = next(p for p in all_products if p['name'] == "Baby Onesie Set")
-            gown = next(p for p in all_products if p['name'] == "Infant Sleep Gown")
-
-            sale1 = {'date': "2024-06-10", 'customer': emma['name'], 'product': onesie['name'], 'quantity': 2, 'total': 2 * onesie['price'], 'size': onesie['size']}
-            self.add_sale(sale1, onesie['id'], emma['id'])
-            sale2 = {'date': "2024-06-12", 'customer': sarah['name'], 'product': gown['name'], 'quantity': 3, 'total': 3 * gown['price'], 'size': gown['size']}
-            self.add_sale(sale2, gown['id'], sarah['id'])
+            emma_id, sarah_id = self.bulk_add_customers(customers)
+
+            self.checkout(emma_id, [(onesie_id, 2)], "2024-06-10")
+            self.checkout(sarah_id, [(gown_id, 3)], "2024-06-12")
 
     def get_all_products(self):
-        cursor = self._execute('SELECT * FROM products ORDER BY name')
+        cursor = self._execute('SELECT * FROM products ORDER BY name, id')
         return self._rows_to_dicts(cursor, cursor.fetchall())
+
+    def get_products_page(self, after_key=None, limit=PAGE_SIZE):
+        """Products in name order, keyed on (name, id)."""
+        return self._keyset_page('SELECT * FROM products ORDER BY name, id LIMIT ?',
+                                 'SELECT * FROM products WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT ?',
+                                 after_key, limit, lambda row: (row['name'], row['id']))
+
+    def iter_products(self, batch_size=500):
+        return self._iter_pages(self.get_products_page, batch_size)
     
+    def get_product(self, product_id):
+        cursor = self._execute('SELECT * FROM products WHERE id = ?', (product_id,))
+        rows = self._rows_to_dicts(cursor, cursor.fetchall())
+        return rows[0] if rows else None
+
     def add_product(self, data):
-        self._execute('INSERT INTO products (name, category, price, stock, condition, age_range, size, color, material, supplier) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
-                     (data['name'], data['category'], data['price'], data['stock'], data['condition'], data['age_range'], data['size'], data['color'], data['material'], data['supplier']))
+        """Insert a product and return its id."""
+        product_id = self._execute('INSERT INTO products (name, category, price, stock, condition, age_range, size, color, material, supplier) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                     (data['name'], data['category'], data['price'], data['stock'], data['condition'], data['age_range'], data['size'], data['color'], data['material'], data['supplier'])).lastrowid
+        self._notify('products', 'insert', product_id)
+        return product_id
+
+    def bulk_add_products(self, rows):
+        """Insert many products in one transaction.
+
+        rows are tuples in (name, category, price, stock, supplier, size,
+        age_range, color, material, condition) order. Returns the new ids.
+        """
+        with self.transaction():
+            count = self._executemany('INSERT INTO products (name, category, price, stock, supplier, size, age_range, color, material, condition) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows).rowcount
+            self._notify('products', 'insert')
+            return self._inserted_ids('products', count)
+
+    def _inserted_ids(self, table, count):
+        # AUTOINCREMENT hands out consecutive ids to rows inserted back to back
+        # inside one transaction, so the batch ends at the current maximum.
+        last_id = self._execute(f'SELECT MAX(id) FROM {table}').fetchone()[0] or 0
+        return list(range(last_id - count + 1, last_id + 1))
 
     def update_product(self, data):
         self._execute('UPDATE products SET name=?, category=?, price=?, stock=?, condition=?, age_range=?, size=?, color=?, material=?, supplier=? WHERE id=?',
                      (data['name'], data['category'], data['price'], data['stock'], data['condition'], data['age_range'], data['size'], data['color'], data['material'], data['supplier'], data['id']))
+        self._notify('products', 'update', data['id'])
+
+    def bulk_update_products(self, rows):
+        """Apply update_product to many product dicts in one transaction."""
+        with self.transaction():
+            self._executemany('UPDATE products SET name=?, category=?, price=?, stock=?, condition=?, age_range=?, size=?, color=?, material=?, supplier=? WHERE id=?',
+                              [(d['name'], d['category'], d['price'], d['stock'], d['condition'], d['age_range'], d['size'], d['color'], d['material'], d['supplier'], d['id']) for d in rows])
+            self._notify('products', 'update')
 
     def delete_product(self, product_id):
         self._execute('DELETE FROM products WHERE id=?', (product_id,))
+        self._notify('products', 'delete', product_id)
 
     def get_all_customers(self):
-        cursor = self._execute('SELECT * FROM customers ORDER BY name')
+        cursor = self._execute('SELECT * FROM customers ORDER BY name, id')
         return self._rows_to_dicts(cursor, cursor.fetchall())
 
+    def get_customers_page(self, after_key=None, limit=PAGE_SIZE):
+        """Customers in name order, keyed on (name, id)."""
+        return self._keyset_page('SELECT * FROM customers ORDER BY name, id LIMIT ?',
+                                 'SELECT * FROM customers WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT ?',
+                                 after_key, limit, lambda row: (row['name'], row['id']))
+
+    def iter_customers(self, batch_size=500):
+        return self._iter_pages(self.get_customers_page, batch_size)
+
+    def get_customer(self, customer_id):
+        cursor = self._execute('SELECT * FROM customers WHERE id = ?', (customer_id,))
+        rows = self._rows_to_dicts(cursor, cursor.fetchall())
+        return rows[0] if rows else None
+
     def add_customer(self, data):
-        self._execute('INSERT INTO customers (name, email, phone, baby_name, baby_age, total_purchases) VALUES (?, ?, ?, ?, ?, 0)',
-                     (data['name'], data['email'], data['phone'], data['baby_name'], data['baby_age']))
+        """Insert a customer and return its id."""
+        customer_id = self._execute('INSERT INTO customers (name, email, phone, baby_name, baby_age, total_purchases) VALUES (?, ?, ?, ?, ?, 0)',
+                     (data['name'], data['email'], data['phone'], data['baby_name'], data['baby_age'])).lastrowid
+        self._notify('customers', 'insert', customer_id)
+        return customer_id
+
+    def bulk_add_customers(self, rows):
+        """Insert many customers in one transaction.
+
+        rows are tuples in (name, email, phone, total_purchases, baby_name,
+        baby_age) order. Returns the new ids.
+        """
+        with self.transaction():
+            count = self._executemany('INSERT INTO customers (name, email, phone, total_purchases, baby_name, baby_age) VALUES (?, ?, ?, ?, ?, ?)', rows).rowcount
+            self._notify('customers', 'insert')
+            return self._inserted_ids('customers', count)
 
     def get_all_sales(self):
         cursor = self._execute('SELECT * FROM sales ORDER BY id DESC')
         return self._rows_to_dicts(cursor, cursor.fetchall())
 
+    def get_sale(self, sale_id):
+        cursor = self._execute('SELECT * FROM sales WHERE id = ?', (sale_id,))
+        rows = self._rows_to_dicts(cursor, cursor.fetchall())
+        return rows[0] if rows else None
+
+    def get_sales_page(self, after_key=None, limit=PAGE_SIZE):
+        """Sales newest first, keyed on (id,)."""
+        return self._keyset_page('SELECT * FROM sales ORDER BY id DESC LIMIT ?',
+                                 'SELECT * FROM sales WHERE id < ? ORDER BY id DESC LIMIT ?',
+                                 after_key, limit, lambda row: (row['id'],))
+
+    def iter_sales(self, batch_size=500):
+        return self._iter_pages(self.get_sales_page, batch_size)
+
+    def iter_table(self, table, batch_size=500):
+        """Every row of products, customers or sales in id order, a batch at a time."""
+        if table not in self.BULK_TABLES:
+            raise ValueError(f"Can't iterate table {table!r}")
+        page = lambda after_key, limit: self._keyset_page(
+            f'SELECT * FROM {table} ORDER BY id LIMIT ?', f'SELECT * FROM {table} WHERE id > ? ORDER BY id LIMIT ?',
+            after_key, limit, lambda row: (row['id'],))
+        return self._iter_pages(page, batch_size)
+
+    # --- Bulk writes ---
+    # Plain rows in and no per-row change events, for imports. Run these
+    # inside transaction() and call notify_bulk_change once done. Column
+    # names go into the SQL as given, so they must come from code.
+    BULK_TABLES = ('products', 'customers', 'sales')
+
+    def _select_in(self, table, columns, column, values):
+        """Yield a cursor over the rows of table whose column is one of values, per chunk of values."""
+        if table not in self.BULK_TABLES:
+            raise ValueError(f"Can't read table {table!r}")
+        values = list(values)
+        for start in range(0, len(values), 500):  # Stay under SQLite's bound-variable limit.
+            chunk = values[start:start + 500]
+            yield self._execute(f"SELECT {columns} FROM {table} WHERE {column} IN ({', '.join('?' * len(chunk))})", chunk)
+
+    def existing_ids(self, table, ids):
+        """The ids out of ids that table has a row for."""
+        return {row[0] for cursor in self._select_in(table, 'id', 'id', ids) for row in cursor}
+
+    def get_rows_by_id(self, table, ids):
+        """{id: row dict} for the ids out of ids that table has a row for."""
+        rows = {}
+        for cursor in self._select_in(table, '*', 'id', ids):
+            rows.update((row['id'], row) for row in self._rows_to_dicts(cursor, cursor.fetchall()))
+        return rows
+
+    def get_sales_on_days(self, days):
+        """Every sale whose sale_date is one of days."""
+        return [sale for cursor in self._select_in('sales', '*', 'sale_date', days)
+                for sale in self._rows_to_dicts(cursor, cursor.fetchall())]
+
+    def upsert_rows(self, table, columns, rows):
+        """Insert rows, value sequences in columns order, updating any whose id is taken."""
+        if table not in self.BULK_TABLES or 'id' not in columns:
+            raise ValueError(f"Can't upsert into {table!r} without an id column")
+        updates = ', '.join(f'{name} = excluded.{name}' for name in columns if name != 'id')
+        self._executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                          f"ON CONFLICT (id) DO UPDATE SET {updates}", rows)
+
+    def insert_rows(self, table, columns, rows):
+        """Insert rows, value sequences in columns order, as new rows."""
+        if table not in self.BULK_TABLES:
+            raise ValueError(f"Can't insert into {table!r}")
+        self._executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", rows)
+
+    def get_recent_sales(self, limit=5):
+        cursor = self._execute('SELECT * FROM sales ORDER BY id DESC LIMIT ?', (limit,))
+        return self._rows_to_dicts(cursor, cursor.fetchall())
+
+    def get_recently_sold_products(self, limit=200):
+        """Distinct products from the latest sales; the hot set for pickers."""
+        cursor = self._execute('SELECT * FROM products WHERE id IN (SELECT product_id FROM sales ORDER BY id DESC LIMIT ?)', (limit,))
+        return self._rows_to_dicts(cursor, cursor.fetchall())
+
+    def get_recent_customers(self, limit=200):
+        """Distinct customers from the latest sales; the hot set for pickers."""
+        cursor = self._execute('SELECT * FROM customers WHERE id IN (SELECT customer_id FROM sales ORDER BY id DESC LIMIT ?)', (limit,))
+        return self._rows_to_dicts(cursor, cursor.fetchall())
+
+    def get_dashboard_summary(self):
+        """Counts and totals for the dashboard, aggregated inside SQLite."""
+        total_products, total_customers, total_revenue = self._execute('''
+            SELECT (SELECT COUNT(*) FROM products),
+                   (SELECT COUNT(*) FROM customers),
+                   (SELECT COALESCE(SUM(total), 0) FROM sales)''').fetchone()
+        low_stock_items = self.count_reorder_alerts()
+        return {
+            'total_products': total_products,
+            'total_customers': total_customers,
+            'total_revenue': total_revenue,
+            'low_stock_items': low_stock_items,
+            'recent_sales': self.get_recent_sales(5),
+        }
+
+    # --- Reorder points ---
+    # products.reorder_point is the threshold in force for a product: its own
+    # own_reorder_point if set, else its category's, else the default. The
+    # triggers from _migrate_reorder_points keep it current, so the partial
+    # index idx_products_reorder only ever holds the products to restock.
+
+    def set_product_reorder_point(self, product_id, reorder_point):
+        """Give one product its own reorder point; None falls back to its category's."""
+        self._execute('UPDATE products SET own_reorder_point = ? WHERE id = ?', (reorder_point, product_id))
+        self._notify('products', 'update', product_id)
+
+    def set_category_reorder_point(self, category, reorder_point):
+        """Set the reorder point for a category; None falls back to the default."""
+        with self.transaction():
+            if reorder_point is None:
+                self._execute('DELETE FROM category_reorder_points WHERE category = ?', (category,))
+            else:
+                self._execute('INSERT OR REPLACE INTO category_reorder_points (category, reorder_point) VALUES (?, ?)',
+                              (category, reorder_point))
+            self._notify('products', 'update')
+
+    def get_category_reorder_points(self):
+        """{category: reorder point} for every category in use or configured."""
+        rows = self._execute('''
+            SELECT category, (SELECT reorder_point FROM category_reorder_points r WHERE r.category = c.category)
+            FROM (SELECT DISTINCT category FROM products WHERE category IS NOT NULL
+                  UNION SELECT category FROM category_reorder_points) c ORDER BY category''').fetchall()
+        return {category: reorder_point for category, reorder_point in rows}
+
+    def count_reorder_alerts(self):
+        return self._execute('SELECT COUNT(*) FROM products WHERE stock <= reorder_point').fetchone()[0]
+
+    def get_reorder_page(self, after_key=None, limit=PAGE_SIZE):
+        """Products at or below their reorder point, emptiest first, keyed on (stock, name, id)."""
+        return self._keyset_page('SELECT * FROM products WHERE stock <= reorder_point ORDER BY stock, name, id LIMIT ?',
+                                 'SELECT * FROM products WHERE stock <= reorder_point AND (stock, name, id) > (?, ?, ?) ORDER BY stock, name, id LIMIT ?',
+                                 after_key, limit, lambda row: (row['stock'], row['name'], row['id']))
+
+    # --- Reports ---
+    # Reports read sales_daily, one row per (day, product_id, category), and
+    # group by a prefix of the ISO day. Sales of since-deleted products are
+    # filed under product_id 0, uncategorised ones under ''.
+    REPORT_PERIODS = {'day': 10, 'month': 7, 'year': 4}
+
+    def _roll_up_sales(self, rows):
+        """Add (sale_date, product_id, quantity, total) rows into sales_daily.
+
+        Must run inside the transaction that inserted the sales.
+        """
+        self._executemany('''
+            INSERT INTO sales_daily (day, product_id, category, quantity, revenue, sale_count)
+            VALUES (?, COALESCE(?, 0), COALESCE((SELECT category FROM products WHERE id = ?), ''), ?, ?, 1)
+            ON CONFLICT (day, product_id, category) DO UPDATE SET
+                quantity = quantity + excluded.quantity, revenue = revenue + excluded.revenue,
+                sale_count = sale_count + 1''',
+            [(day, product_id, product_id, quantity, total) for day, product_id, quantity, total in rows])
+
+    def add_imported_sales(self, rows):
+        """Account for sales rows inserted directly, e.g. by an import.
+
+        rows are dicts with sale_date, product_id, customer_id, quantity and
+        total. They are added to sales_daily and their customers queued for
+        reconciliation. Must run inside the transaction that inserted them.
+        """
+        self._roll_up_sales([(row['sale_date'], row['product_id'], row['quantity'], row['total']) for row in rows])
+        self._executemany('INSERT OR IGNORE INTO customer_totals_dirty VALUES (?)',
+                          {(row['customer_id'],) for row in rows if row['customer_id'] is not None})
+
+    def rebuild_sales_daily(self):
+        """Recompute sales_daily from scratch out of sales."""
+        with self.transaction():
+            self._execute('DELETE FROM sales_daily')
+            self._execute('''
+                INSERT INTO sales_daily (day, product_id, category, quantity, revenue, sale_count)
+                SELECT s.sale_date, COALESCE(s.product_id, 0), COALESCE(p.category, ''),
+                       COALESCE(SUM(s.quantity), 0), COALESCE(SUM(s.total), 0), COUNT(*)
+                FROM sales s LEFT JOIN products p ON p.id = s.product_id
+                WHERE s.sale_date IS NOT NULL GROUP BY 1, 2, 3''')
+
+    def get_revenue_by_period(self, period='month', start=None, end=None):
+        """Revenue and quantity per day, month or year, oldest first.
+
+        start and end are ISO days and both inclusive; None means unbounded.
+        """
+        width = self.REPORT_PERIODS[period]
+        # Summing each day first walks sales_daily in primary key order, so
+        # only one row per day is left to group by period.
+        cursor = self._execute(f'''
+            SELECT substr(day, 1, {width}) AS period, SUM(revenue) AS revenue, SUM(quantity) AS quantity
+            FROM (SELECT day, SUM(revenue) AS revenue, SUM(quantity) AS quantity
+                  FROM sales_daily WHERE day BETWEEN ? AND ? GROUP BY day)
+            GROUP BY period ORDER BY period''',
+            (start or '0000', end or '9999'))
+        return self._rows_to_dicts(cursor, cursor.fetchall())
+
+    def get_revenue_by_category(self, start=None, end=None):
+        """Revenue and quantity per category, best selling first."""
+        if start is None and end is None:
+            # All time: read idx_sales_daily_category in category order.
+            cursor = self._execute('''
+                SELECT category, SUM(revenue) AS revenue, SUM(quantity) AS quantity
+                FROM sales_daily GROUP BY category ORDER BY revenue DESC''')
+        else:
+            cursor = self._execute('''
+                SELECT category, SUM(revenue) AS revenue, SUM(quantity) AS quantity
+                FROM sales_daily WHERE day BETWEEN ? AND ? GROUP BY category ORDER BY revenue DESC''',
+                (start or '0000', end or '9999'))
+        return self._rows_to_dicts(cursor, cursor.fetchall())
+
+    def get_sales_report(self, period='month', start=None, end=None):
+        """Everything the reports screen shows, in one worker round-trip."""
+        return {
+            'periods': self.get_revenue_by_period(period, start, end),
+            'categories': self.get_revenue_by_category(start, end),
+        }
+
+    # --- Reconciliation ---
+    # customers.total_purchases is a running counter bumped by every sale.
+    # These passes recompute it from sales and correct any drift. The
+    # incremental pass only looks at customers with sales past the
+    # high-water mark, plus those whose sales were edited or deleted (put
+    # in customer_totals_dirty by triggers); the full pass checks everyone.
+    RECONCILE_BATCH_SIZE = 500
+
+    def _get_state(self, key, default=None):
+        row = self._execute('SELECT value FROM app_state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_state(self, key, value):
+        self._execute('INSERT OR REPLACE INTO app_state (key, value) VALUES (?, ?)', (key, value))
+
+    def _correct_customer_totals(self, customer_ids):
+        """Recompute the given customers' totals from sales; return the ids fixed."""
+        corrected = []
+        customer_ids = list(customer_ids)
+        for start in range(0, len(customer_ids), self.RECONCILE_BATCH_SIZE):
+            batch = customer_ids[start:start + self.RECONCILE_BATCH_SIZE]
+            placeholders = ', '.join('?' * len(batch))
+            rows = self._execute(f'''
+                SELECT c.id, c.total_purchases, COALESCE((SELECT SUM(total) FROM sales WHERE customer_id = c.id), 0)
+                FROM customers c WHERE c.id IN ({placeholders})''', batch).fetchall()
+            fixes = [(round(actual, 2), customer_id) for customer_id, recorded, actual in rows
+                     if abs((recorded or 0) - actual) >= 0.005]
+            self._executemany('UPDATE customers SET total_purchases = ? WHERE id = ?', fixes)
+            corrected += [customer_id for _, customer_id in fixes]
+        return corrected
+
+    def _notify_corrected(self, corrected):
+        if len(corrected) == 1:
+            self._notify('customers', 'update', corrected[0])
+        elif corrected:
+            self._notify('customers', 'update')
+
+    def reconcile_customer_totals(self):
+        """Incremental pass: fix customers touched since the last run."""
+        started = time.perf_counter()
+        with self.transaction():
+            high_water = self._get_state('customer_totals_high_water', 0)
+            last_sale_id = self._execute('SELECT COALESCE(MAX(id), 0) FROM sales').fetchone()[0]
+            customer_ids = [row[0] for row in self._execute('''
+                SELECT customer_id FROM sales WHERE id > ? AND id <= ? AND customer_id IS NOT NULL
+                UNION SELECT customer_id FROM customer_totals_dirty''', (high_water, last_sale_id))]
+            corrected = self._correct_customer_totals(customer_ids)
+            self._execute('DELETE FROM customer_totals_dirty')
+            self._set_state('customer_totals_high_water', last_sale_id)
+            self._notify_corrected(corrected)
+        stats = ReconcileStats('incremental', len(customer_ids), len(corrected), last_sale_id,
+                               time.perf_counter() - started)
+        self.last_reconcile['incremental'] = stats
+        return stats
+
+    def verify_customer_totals(self, stop_event=None):
+        """Full pass over every customer, one short transaction per batch so
+        sales can still be written in between. Stops early if stop_event is set.
+        """
+        started = time.perf_counter()
+        checked, corrected, after_id = 0, 0, 0
+        while stop_event is None or not stop_event.is_set():
+            with self.transaction():
+                customer_ids = [row[0] for row in self._execute('SELECT id FROM customers WHERE id > ? ORDER BY id LIMIT ?',
+                                                                (after_id, self.RECONCILE_BATCH_SIZE))]
+                if not customer_ids:
+                    break
+                fixed = self._correct_customer_totals(customer_ids)
+                self._notify_corrected(fixed)
+            checked += len(customer_ids)
+            corrected += len(fixed)
+            after_id = customer_ids[-1]
+        stats = ReconcileStats('full', checked, corrected, None, time.perf_counter() - started)
+        self.last_reconcile['full'] = stats
+        return stats
+
+    def start_full_verify(self, callback=None):
+        """Run verify_customer_totals on its own thread, off the worker queue.
+
+        callback(stats) is called on the Kivy main loop when it finishes.
+        """
+        if self._verify_thread is not None and self._verify_thread.is_alive():
+            return
+        def run():
+            try:
+                stats = self.verify_customer_totals(self._verify_stop)
+            except sqlite3.Error as e:
+                print(f"Customer totals verify failed: {e}")
+                return
+            if stats.corrected:
+                print(f"Corrected {stats.corrected} of {stats.customers_checked} customer totals in {stats.seconds:.2f}s")
+            if callback is not None:
+                Clock.schedule_once(lambda dt: callback(stats))
+        self._verify_stop.clear()
+        self._verify_thread = threading.Thread(target=run, name='customer-verify', daemon=True)
+        self._verify_thread.start()
+
     def add_sale(self, sale_data, product_id, customer_id):
+        """Record a sale and return its id, or None if the database write failed.
+
+        Raises ValueError if sale_data['date'] can't be parsed.
+        """
+        return self.bulk_add_sales([(sale_data, product_id, customer_id)])
+
+    def checkout(self, customer_id, lines, date):
+        """Sell a basket to a customer as one order, in one transaction.
+
+        lines is a list of (product_id, quantity). Each line takes its stock
+        with a conditional UPDATE ... WHERE stock >= ?, so two counters can
+        never sell the same last item; if any line comes up short the whole
+        order rolls back and OutOfStockError is raised. Prices and names are
+        read inside the transaction. Returns the new order id.
+        """
+        quantities = {}
+        for product_id, quantity in lines:
+            if quantity <= 0:
+                raise ValueError(f"Quantity must be positive, got {quantity}")
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+        if not quantities:
+            raise ValueError("Cannot check out an empty basket")
+        date = iso_date(date)
+
+        with self.transaction():
+            customer = self.get_customer(customer_id)
+            if customer is None:
+                raise ValueError(f"No customer with id {customer_id}")
+            placeholders = ', '.join('?' * len(quantities))
+            cursor = self._execute(f'SELECT * FROM products WHERE id IN ({placeholders})', list(quantities))
+            products = {row['id']: row for row in self._rows_to_dicts(cursor, cursor.fetchall())}
+
+            for product_id, quantity in quantities.items():
+                taken = self._execute('UPDATE products SET stock = stock - ? WHERE id = ? AND stock >= ?',
+                                      (quantity, product_id, quantity)).rowcount
+                if not taken:
+                    name = products[product_id]['name'] if product_id in products else f"product #{product_id}"
+                    raise OutOfStockError(product_id, name, quantity)
+
+            order_lines = [(product_id, products[product_id], quantity, quantity * products[product_id]['price'])
+                           for product_id, quantity in quantities.items()]
+            order_total = sum(line_total for _, _, _, line_total in order_lines)
+            order_id = self._execute('INSERT INTO orders (date, customer_id, customer_name, total) VALUES (?, ?, ?, ?)',
+                                     (date, customer_id, customer['name'], order_total)).lastrowid
+            self._executemany('INSERT INTO order_lines (order_id, product_id, product_name, size, quantity, unit_price, total) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                              [(order_id, product_id, product['name'], product['size'], quantity, product['price'], line_total)
+                               for product_id, product, quantity, line_total in order_lines])
+            sale_count = self._executemany('INSERT INTO sales (date, customer_name, product_name, quantity, total, size, product_id, customer_id, order_id, sale_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                           [(date, customer['name'], product['name'], quantity, line_total, product['size'], product_id, customer_id, order_id, date)
+                                            for product_id, product, quantity, line_total in order_lines]).rowcount
+            self._roll_up_sales([(date, product_id, quantity, line_total) for product_id, _, quantity, line_total in order_lines])
+            self._execute('UPDATE customers SET total_purchases = total_purchases + ? WHERE id = ?', (order_total, customer_id))
+
+            self._notify('orders', 'insert', order_id)
+            for sale_id in self._inserted_ids('sales', sale_count):
+                self._notify('sales', 'insert', sale_id)
+            for product_id in quantities:
+                self._notify('products', 'update', product_id)
+            self._notify('customers', 'update', customer_id)
+            return order_id
+
+    def bulk_add_sales(self, sales):
+        """Record many sales in one transaction.
+
+        sales is an iterable of (sale_data, product_id, customer_id), as taken
+        by add_sale. Stock, customer totals and sales_daily are adjusted
+        alongside. Raises ValueError if a date can't be parsed.
+        Returns the id of the last sale inserted, or None if it failed.
+        """
+        sales = [(s, product_id, customer_id, iso_date(s['date'])) for s, product_id, customer_id in sales]
+        nested = self.in_transaction
         try:
-            with sqlite3.connect(self.db_name) as conn:
-                cursor = conn.cursor()
-                cursor.execute('INSERT INTO sales (date, customer_name, product_name, quantity, total, size) VALUES (?, ?, ?, ?, ?, ?)',
-                               (sale_data['date'], sale_data['customer'], sale_data['product'], sale_data['quantity'], sale_data['total'], sale_data['size']))
-                cursor.execute('UPDATE products SET stock = stock - ? WHERE id = ?', (sale_data['quantity'], product_id))
-                cursor.execute('UPDATE customers SET total_purchases = total_purchases + ? WHERE id = ?', (sale_data['total'], customer_id))
+            with self.transaction():
+                self._executemany('INSERT INTO sales (date, customer_name, product_name, quantity, total, size, product_id, customer_id, sale_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                  [(s['date'], s['customer'], s['product'], s['quantity'], s['total'], s['size'], product_id, customer_id, sale_date)
+                                   for s, product_id, customer_id, sale_date in sales])
+                self._roll_up_sales([(sale_date, product_id, s['quantity'], s['total'])
+                                     for s, product_id, _, sale_date in sales])
+                self._executemany('UPDATE products SET stock = stock - ? WHERE id = ?',
+                                  [(s['quantity'], product_id) for s, product_id, _, _ in sales])
+                self._executemany('UPDATE customers SET total_purchases = total_purchases + ? WHERE id = ?',
+                                  [(s['total'], customer_id) for s, _, customer_id, _ in sales])
+                sale_id = self._execute('SELECT MAX(id) FROM sales').fetchone()[0]
+                if len(sales) == 1:
+                    _, product_id, customer_id, _ = sales[0]
+                    self._notify('sales', 'insert', sale_id)
+                    self._notify('products', 'update', product_id)
+                    self._notify('customers', 'update', customer_id)
+                else:
+                    self._notify('sales', 'insert')
+                    self._notify('products', 'update')
+                    self._notify('customers', 'update')
+                return sale_id
         except sqlite3.Error as e:
+            if nested:
+                raise  # Let the enclosing transaction roll back as a whole.
             print(f"Database transaction failed: {e}")
-
-# (### NEW ###) --- RESPONSIVE BASE CLASS ---
+            return None
+
+# --- Import / Export ---
+
+# Reported after every batch of an import or export, and returned at the
+# end. errors holds (line number, message) for rows that were skipped.
+TransferProgress = namedtuple('TransferProgress', 'table rows inserted updated skipped errors seconds')
+
+
+def _optional(convert):
+    return lambda value: None if value in (None, '') else convert(value)
+
+
+class DataTransfer:
+    """Streams products, customers and sales to and from CSV or JSON lines.
+
+    Files are read and written a batch at a time, so memory use does not
+    grow with the file. Each import batch is validated and written in its
+    own transaction with executemany. Products and customers with an id
+    are upserted. Sales are an append-only ledger: a sale whose id is
+    already held by the same sale is skipped, which makes re-importing a
+    backup safe, while one whose id is held by a different sale is added
+    under a new id.
+    """
+    BATCH_SIZE = 1000
+    MAX_ERRORS = 100  # Row errors kept in the report; later ones are only counted
+    FORMATS = ('.csv', '.jsonl')
+    # Exported columns and how each imported value is checked. A required
+    # column may not be blank; the converter raises ValueError on bad input.
+    COLUMNS = {
+        'products': (
+            ('id', _optional(int), False), ('name', str, True), ('category', str, False),
+            ('price', float, True), ('stock', int, True), ('supplier', str, False), ('size', str, False),
+            ('age_range', str, False), ('color', str, False), ('material', str, False),
+            ('condition', str, False), ('own_reorder_point', _optional(int), False),
+        ),
+        'customers': (
+            ('id', _optional(int), False), ('name', str, True), ('email', str, False), ('phone', str, False),
+            ('total_purchases', _optional(float), False), ('baby_name', str, False), ('baby_age', str, False),
+        ),
+        'sales': (
+            ('id', _optional(int), False), ('date', iso_date, True), ('customer_name', str, False),
+            ('product_name', str, False), ('quantity', int, True), ('total', float, True), ('size', str, False),
+            ('product_id', _optional(int), False), ('customer_id', _optional(int), False),
+        ),
+    }
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    def _check_target(self, table, path):
+        if table not in self.COLUMNS:
+            raise ValueError(f"Can't transfer table {table!r}")
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in self.FORMATS:
+            raise ValueError(f"Unsupported file type {extension!r}, use .csv or .jsonl")
+        return extension
+
+    # --- Export ---
+
+    def export_file(self, table, path, progress=None):
+        """Write every row of table to path, one batch of rows at a time."""
+        extension = self._check_target(table, path)
+        columns = [name for name, _, _ in self.COLUMNS[table]]
+        started = time.perf_counter()
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            if extension == '.csv':
+                writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+                writer.writeheader()
+                write = writer.writerow
+            else:
+                write = lambda row: f.write(json.dumps({name: row[name] for name in columns}) + '\n')
+            for row in self.db.iter_table(table, self.BATCH_SIZE):
+                write(row)
+                count += 1
+                if progress is not None and count % self.BATCH_SIZE == 0:
+                    progress(TransferProgress(table, count, 0, 0, 0, [], time.perf_counter() - started))
+        result = TransferProgress(table, count, 0, 0, 0, [], time.perf_counter() - started)
+        if progress is not None:
+            progress(result)
+        return result
+
+    # --- Import ---
+
+    def _read_rows(self, path, extension):
+        """Yield (line number, dict) pairs; unreadable lines yield (line, None)."""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            if extension == '.csv':
+                reader = csv.DictReader(f)
+                for row in reader:
+                    yield reader.line_num, row
+            else:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        row = None
+                    yield line_number, row if isinstance(row, dict) else None
+
+    def _validate(self, table, raw):
+        """Return raw converted to a {column: value} dict, or raise ValueError."""
+        row = {}
+        for name, convert, required in self.COLUMNS[table]:
+            value = raw.get(name)
+            if isinstance(value, str):
+                value = value.strip()
+            if value in (None, ''):
+                if required:
+                    raise ValueError(f"{name} is required")
+                row[name] = None
+                continue
+            try:
+                row[name] = convert(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"bad {name} {value!r}") from None
+        return row
+
+    def import_file(self, table, path, progress=None):
+        """Load path into table in batches, skipping rows that don't validate.
+
+        progress(TransferProgress) is called after each batch, on the thread
+        running the import. Returns the final TransferProgress.
+        """
+        extension = self._check_target(table, path)
+        started = time.perf_counter()
+        state = {'rows': 0, 'inserted': 0, 'updated': 0, 'skipped': 0, 'errors': []}
+
+        def report():
+            return TransferProgress(table, state['rows'], state['inserted'], state['updated'], state['skipped'],
+                                    state['errors'], time.perf_counter() - started)
+
+        def reject(line_number, message):
+            state['skipped'] += 1
+            if len(state['errors']) < self.MAX_ERRORS:
+                state['errors'].append((line_number, message))
+
+        batch = []
+        for line_number, raw in self._read_rows(path, extension):
+            state['rows'] += 1
+            if raw is None:
+                reject(line_number, 'not a JSON object')
+                continue
+            try:
+                batch.append((line_number, self._validate(table, raw)))
+            except ValueError as e:
+                reject(line_number, str(e))
+                continue
+            if len(batch) >= self.BATCH_SIZE:
+                self._write_batch(table, batch, state, reject)
+                batch = []
+                if progress is not None:
+                    progress(report())
+        if batch:
+            self._write_batch(table, batch, state, reject)
+        if table == 'sales':
+            self.db.reconcile_customer_totals()
+        self.db.notify_bulk_change(table)
+        result = report()
+        if progress is not None:
+            progress(result)
+        return result
+
+    def _write_batch(self, table, batch, state, reject):
+        """Write a batch of (line number, row) pairs in one transaction."""
+        db = self.db
+        with db.transaction():
+            if table == 'sales':
+                rows = self._new_sales(batch, reject)
+                self._link_sales(rows)
+                updated = 0
+            else:
+                rows = [row for _, row in batch]
+                existing = db.existing_ids(table, {row['id'] for row in rows if row['id'] is not None})
+                updated = sum(1 for row in rows if row['id'] in existing)
+            state['updated'] += updated
+            state['inserted'] += len(rows) - updated
+
+            columns = [name for name, _, _ in self.COLUMNS[table]]
+            if table == 'sales':
+                columns.append('sale_date')
+                for row in rows:
+                    row['sale_date'] = row['date']
+            if table == 'customers':
+                for row in rows:
+                    row['total_purchases'] = row['total_purchases'] or 0
+            with_id = [[row[name] for name in columns] for row in rows if row['id'] is not None]
+            without_id = [[row[name] for name in columns[1:]] for row in rows if row['id'] is None]
+            if with_id:
+                # _new_sales only leaves sales ids that are free.
+                (db.insert_rows if table == 'sales' else db.upsert_rows)(table, columns, with_id)
+            if without_id:
+                db.insert_rows(table, columns[1:], without_id)
+            if table == 'sales':
+                db.add_imported_sales(rows)
+
+    @staticmethod
+    def _sale_key(sale, date_column='date'):
+        # What makes two sales the same sale; blanks may be NULL or ''.
+        return (sale[date_column], sale['customer_name'] or None, sale['product_name'] or None,
+                sale['quantity'], round(sale['total'] or 0, 2), sale['size'] or None)
+
+    def _new_sales(self, batch, reject):
+        """The rows of batch to insert, rejecting the sales already recorded.
+
+        A row whose id is held by the same sale, in the database or earlier
+        in the file, is a duplicate. A row whose id is held by a different
+        sale is a duplicate too if the same sale was recorded under another
+        id (as a previous import of the file would have), and is otherwise
+        kept with its id cleared so it gets a new one.
+        """
+        held = self.db.get_rows_by_id('sales', {row['id'] for _, row in batch if row['id'] is not None})
+        held = {sale_id: self._sale_key(sale, 'sale_date') for sale_id, sale in held.items()}
+        moved_days = {row['date'] for _, row in batch if row['id'] in held and held[row['id']] != self._sale_key(row)}
+        recorded = {self._sale_key(sale, 'sale_date'): f"sale #{sale['id']}" for sale in self.db.get_sales_on_days(moved_days)}
+        rows = []
+        for line_number, row in batch:
+            key = self._sale_key(row)
+            if row['id'] in held:
+                if held[row['id']] == key:
+                    reject(line_number, f"already recorded as sale #{row['id']}")
+                elif key in recorded:
+                    reject(line_number, f"already recorded as {recorded[key]}")
+                else:
+                    row['id'] = None
+                    recorded[key] = f"line {line_number}"
+                    rows.append(row)
+                continue
+            if row['id'] is not None:
+                held[row['id']] = key
+            rows.append(row)
+        return rows
+
+    def _link_sales(self, rows):
+        # Sales keep their names as a snapshot; ids that don't exist in this
+        # database are dropped rather than failing the foreign key.
+        for column, table in (('product_id', 'products'), ('customer_id', 'customers')):
+            known = self.db.existing_ids(table, {row[column] for row in rows if row[column] is not None})
+            for row in rows:
+                if row[column] not in known:
+                    row[column] = None
+
+# --- Responsive Base Class ---
 class ResponsiveScreen(Screen):
     breakpoint = dp(600)  # Width threshold to switch between mobile/desktop
 
+    watched_tables = ()  # Tables whose changes make this screen's data stale
+    # Hooks timed under "<Screen>.<method>" when profiling, along with every
+    # show_*_popup method.
+    PROFILED_METHODS = ('on_enter', 'build_ui', 'update_layout', 'refresh_data')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not PROFILE:
+            return
+        names = set(cls.PROFILED_METHODS)
+        names.update(attr for attr in vars(cls) if attr.startswith('show_') and attr.endswith('_popup'))
+        for attr in names:
+            method = getattr(cls, attr)
+            setattr(cls, attr, timed(f'{cls.__name__}.{attr}')(getattr(method, '__wrapped__', method)))
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._is_built = False
+        self._dirty = True
+        self.is_mobile = None  # The layout update_layout last applied
+        # Only the screen on show follows resizes, at most once a frame.
+        self._layout_trigger = Clock.create_trigger(self.apply_layout, -1)
+
+    def on_pre_enter(self, *args):
+        # The pre_ events always come in pairs, even when a transition is
+        # interrupted and on_enter / on_leave are skipped.
         Window.bind(on_resize=self.on_window_resize)
 
+    def on_pre_leave(self, *args):
+        Window.unbind(on_resize=self.on_window_resize)
+        self._layout_trigger.cancel()
+
     def on_enter(self, *args):
         if not self._is_built:
             self.build_ui()
             self._is_built = True
-        self.update_layout() # Call on enter to set initial layout
-        self.refresh_data()  # Method to be implemented by child screens
+        self.apply_layout()  # Catch up on resizes made while hidden
+        if self._dirty:
+            self._dirty = False
+            self.refresh_data()  # Method to be implemented by child screens
+
+    @mainthread
+    def on_data_changed(self, event):
+        """DatabaseManager subscriber: patch or invalidate what is on screen."""
+        if event.table not in self.watched_tables:
+            return
+        if self._dirty or self.apply_change(event):
+            return
+        if self.manager is not None and self.manager.current_screen is self:
+            self.refresh_data()
+        else:
+            self._dirty = True
 
     def on_window_resize(self, window, width, height):
-        self.update_layout()
+        if self._is_built:
+            self._layout_trigger()
+
+    def apply_layout(self, *args):
+        """Call update_layout if the window has crossed the breakpoint."""
+        is_mobile = Window.width < self.breakpoint
+        if is_mobile != self.is_mobile:
+            self.is_mobile = is_mobile
+            self.update_layout()
 
     def build_ui(self):
         """To be implemented by subclasses to create widgets."""
         pass
 
     def update_layout(self):
-        """To be implemented by subclasses to adjust layout based on size."""
+        """To be implemented by subclasses to switch layout on self.is_mobile."""
         pass
     
     def refresh_data(self):
         """To be implemented by subclasses to reload data from DB."""
         pass
 
+    def apply_change(self, event):
+        """Optionally implemented by subclasses to apply a single-row change
+        in place. Return True if handled, otherwise the screen reloads."""
+        return False
+
+# --- Popup Forms ---
+
+class PopupForm:
+    """A form popup whose widgets are built once and reused on every open.
+
+    Subclasses add their fields in build_fields(layout), clear and fill them
+    in reset(*args) (called with open's arguments) and act on the Save
+    button in save().
+    """
+    title = ''
+    save_text = 'Save'
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.popup = None
+        self._session = 0  # Bumped on each open, so stale callbacks can tell.
+
+    def prepare(self, *args):
+        """Build the widgets now, ahead of the first open.
+
+        Screens schedule this shortly after build_ui, once their own
+        entrance has finished, so even the first open is instant.
+        """
+        if self.popup is None:
+            self.popup = self._build()
+
+    def open(self, *args):
+        self.prepare()
+        self._session += 1
+        self.reset(*args)
+        self.popup.open()
+
+    def dismiss(self, *args):
+        self.popup.dismiss()
+
+    def _build(self):
+        from kivy.uix.popup import Popup
+        layout = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
+        self.title_label = Label(text=self.title, font_size=dp(18), bold=True, size_hint_y=None, height=dp(40), color=(0.2,0.2,0.2,1))
+        layout.add_widget(self.title_label)
+        self.build_fields(layout)
+        buttons_layout = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(50))
+        self.save_btn = ModernButton(text=self.save_text)
+        cancel_btn = Button(text='Cancel', background_normal='', background_color=(0.7, 0.7, 0.7, 1))
+        buttons_layout.add_widget(self.save_btn)
+        buttons_layout.add_widget(cancel_btn)
+        layout.add_widget(buttons_layout)
+        self.save_btn.bind(on_press=lambda x: self.save())
+        cancel_btn.bind(on_press=self.dismiss)
+        return Popup(title='', content=layout, size_hint=(0.9, 0.9), separator_height=0)
+
+    def build_fields(self, layout):
+        pass
+
+    def reset(self, *args):
+        pass
+
+    def save(self):
+        pass
+
+
+class ProductForm(PopupForm):
+    """Add a product, or edit the one passed to open()."""
+    save_text = 'Save Item'
+    CATEGORIES = ['Bodysuits', 'Sleepwear', 'Outerwear', 'Dresses', 'Accessories']
+    AGE_RANGES = ['Newborn', '0-3M', '3-6M', '6-9M', '9-12M', '12-18M', '18-24M','3A','Toddler']
+
+    def build_fields(self, layout):
+        from kivy.uix.checkbox import CheckBox
+        from kivy.uix.spinner import Spinner
+        self.name_input = ModernTextInput(hint_text='Product Name')
+        self.category_spinner = Spinner(values=self.CATEGORIES, size_hint_y=None, height=dp(40))
+        self.age_range_spinner = Spinner(values=self.AGE_RANGES, size_hint_y=None, height=dp(40))
+        self.price_input = ModernTextInput(hint_text='Price (e.g., 24.99)')
+        self.stock_input = ModernTextInput(hint_text='Stock Quantity')
+        self.reorder_input = ModernTextInput(hint_text='Reorder at (blank = category default)', input_filter='int')
+
+        condition_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(40), spacing=dp(5))
+        condition_label = Label(text='Condition:', color=(0.2,0.2,0.2,1), size_hint_x=0.4)
+        self.cb_new = CheckBox(group='condition', allow_no_selection=False, active=True, size_hint_x=0.1)
+        self.cb_used = CheckBox(group='condition', allow_no_selection=False, size_hint_x=0.1)
+        condition_layout.add_widget(condition_label)
+        condition_layout.add_widget(self.cb_new)
+        condition_layout.add_widget(Label(text='New', color=(0.2,0.2,0.2,1), size_hint_x=0.2))
+        condition_layout.add_widget(self.cb_used)
+        condition_layout.add_widget(Label(text='Used', color=(0.2,0.2,0.2,1), size_hint_x=0.2))
+
+        for widget in (self.name_input, self.category_spinner, self.age_range_spinner, self.price_input,
+                       self.stock_input, self.reorder_input, condition_layout):
+            layout.add_widget(widget)
+
+    def reset(self, product=None):
+        self.product = product
+        product = product or {}
+        self.title_label.text = 'Edit Item' if self.product else 'Add New Item'
+        self.name_input.text = product.get('name', '')
+        self.category_spinner.text = product.get('category', 'Select Category')
+        self.age_range_spinner.text = product.get('age_range', 'Select Age Range')
+        self.price_input.text = str(product['price']) if 'price' in product else ''
+        self.stock_input.text = str(product['stock']) if 'stock' in product else ''
+        own_reorder_point = product.get('own_reorder_point')
+        self.reorder_input.text = str(own_reorder_point) if own_reorder_point is not None else ''
+        if product.get('condition') == 'Gently Used':
+            self.cb_used.active = True
+        else:
+            self.cb_new.active = True
+
+    def save(self):
+        product = self.product
+        try:
+            product_data = {
+                'name': self.name_input.text, 'category': self.category_spinner.text, 'price': float(self.price_input.text),
+                'stock': int(self.stock_input.text), 'condition': 'Gently Used' if self.cb_used.active else 'New',
+                'age_range': self.age_range_spinner.text, 'size': self.age_range_spinner.text,
+                'color': product.get('color', 'N/A') if product else 'N/A',
+                'material': product.get('material', 'N/A') if product else 'N/A',
+                'supplier': product.get('supplier', 'N/A') if product else 'N/A',
+            }
+            reorder_point = int(self.reorder_input.text) if self.reorder_input.text.strip() else None
+        except ValueError:
+            # Add error feedback here if desired
+            return
+        if product:
+            product_data['id'] = product['id']
+            self.db_manager.run_async(self.db_manager.update_product, product_data)
+            if reorder_point != product.get('own_reorder_point'):
+                self.db_manager.run_async(self.db_manager.set_product_reorder_point, product['id'], reorder_point)
+        elif reorder_point is not None:
+            self.db_manager.run_async(self.db_manager.add_product, product_data,
+                                      callback=lambda product_id: self.db_manager.run_async(
+                                          self.db_manager.set_product_reorder_point, product_id, reorder_point))
+        else:
+            self.db_manager.run_async(self.db_manager.add_product, product_data)
+        self.dismiss()
+
+
+class SaleForm(PopupForm):
+    """A basket: pick product + quantity, add as many lines as needed, then
+    check out the whole order in a single round-trip to the database."""
+    title = 'Record New Sale'
+    save_text = 'Checkout'
+    # Writes to these make the pickers' recent customers / products stale.
+    hot_tables = ('sales', 'customers', 'products')
+
+    def __init__(self, db_manager):
+        super().__init__(db_manager)
+        self.basket = []  # [product row, quantity]
+        self._hot_rows_stale = True
+        db_manager.subscribe(self._on_data_changed)
+
+    def _on_data_changed(self, event):
+        if event.table in self.hot_tables:
+            self._hot_rows_stale = True
+
+    def build_fields(self, layout):
+        self.customer_picker = AutocompletePicker(self.db_manager.run_async, self.db_manager.search_customers,
+                                                  label=lambda c: f"{c['name']} - {c['phone']}" if c['phone'] else c['name'],
+                                                  hint_text='Customer')
+        self.product_picker = AutocompletePicker(self.db_manager.run_async, self.db_manager.search_products,
+                                                 label=lambda p: f"{p['name']} ({p['size']}) - ${p['price']:.2f}",
+                                                 hint_text='Product', row_filter=lambda p: p['stock'] > 0)
+        self.quantity_input = ModernTextInput(hint_text='Qty', input_filter='int', size_hint_x=None, width=dp(70))
+        add_line_btn = ModernButton(text='Add to basket', size_hint_x=None, width=dp(140))
+        add_line_btn.bind(on_press=self.add_line)
+        self.date_input = ModernTextInput(hint_text='Date (YYYY-MM-DD)')
+        self.basket_layout = BoxLayout(orientation='vertical', spacing=dp(4), size_hint_y=None)
+        self.basket_layout.bind(minimum_height=self.basket_layout.setter('height'))
+        basket_scroll = ScrollView()
+        basket_scroll.add_widget(self.basket_layout)
+        self.total_label = Label(text='', bold=True, color=(0.1, 0.3, 0.5, 1), size_hint_y=None, height=dp(30))
+        self.error_label = Label(text='', color=(0.9, 0.3, 0.3, 1), size_hint_y=None, height=dp(30))
+
+        line_layout = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None)
+        self.product_picker.bind(height=lambda picker, height: setattr(line_layout, 'height', height))
+        line_layout.height = self.product_picker.height
+        line_layout.add_widget(self.product_picker)
+        line_layout.add_widget(self.quantity_input)
+        line_layout.add_widget(add_line_btn)
+
+        for widget in (self.date_input, self.customer_picker, line_layout, basket_scroll, self.total_label, self.error_label):
+            layout.add_widget(widget)
+
+    def reset(self):
+        self.customer_picker.reset()
+        self.product_picker.reset()
+        self.quantity_input.text = '1'
+        self.date_input.text = datetime.date.today().isoformat()
+        self.error_label.text = ''
+        self.basket = []
+        self.show_basket()
+        if self._hot_rows_stale:
+            # Cleared first, so a write while these are in flight marks them stale again.
+            self._hot_rows_stale = False
+            self.db_manager.run_async(self.db_manager.get_recent_customers, callback=self.customer_picker.set_hot_rows)
+            self.db_manager.run_async(self.db_manager.get_recently_sold_products, callback=self.product_picker.set_hot_rows)
+
+    def show_basket(self):
+        self.basket_layout.clear_widgets()
+        for line in self.basket:
+            product, quantity = line
+            row = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(36))
+            row.add_widget(Label(text=f"{product['name']} ({product['size']}) x{quantity}", color=(0.2, 0.2, 0.2, 1)))
+            row.add_widget(Label(text=f"${quantity * product['price']:.2f}", size_hint_x=None, width=dp(90), color=(0.2, 0.2, 0.2, 1)))
+            remove_btn = Button(text='Remove', size_hint_x=None, width=dp(90), background_normal='', background_color=(0.9, 0.3, 0.3, 1))
+            remove_btn.bind(on_press=lambda x, line=line: self.remove_line(line))
+            row.add_widget(remove_btn)
+            self.basket_layout.add_widget(row)
+        total = sum(quantity * product['price'] for product, quantity in self.basket)
+        self.total_label.text = f"Total: ${total:.2f}" if self.basket else 'Basket is empty.'
+        self.save_btn.disabled = not self.basket
+
+    def add_line(self, instance):
+        product = self.product_picker.selected
+        try:
+            quantity = int(self.quantity_input.text)
+        except ValueError:
+            quantity = 0
+        if product is None or quantity <= 0:
+            return
+        for line in self.basket:
+            if line[0]['id'] == product['id']:
+                line[1] += quantity
+                break
+        else:
+            self.basket.append([product, quantity])
+        self.error_label.text = ''
+        self.product_picker.reset()
+        self.quantity_input.text = '1'
+        self.show_basket()
+
+    def remove_line(self, line):
+        self.basket.remove(line)
+        self.show_basket()
+
+    def save(self):
+        customer = self.customer_picker.selected
+        if customer is None:
+            self.error_label.text = 'Choose a customer.'
+            return
+        if not self.basket:
+            return
+        self.save_btn.disabled = True
+        session = self._session
+        lines = [(product['id'], quantity) for product, quantity in self.basket]
+        self.db_manager.run_async(self.db_manager.checkout, customer['id'], lines, self.date_input.text,
+                                  callback=lambda order_id: self._checked_out(session),
+                                  error_callback=lambda error: self._checkout_failed(session, error))
+
+    def _checked_out(self, session):
+        if session == self._session:
+            self.dismiss()
+
+    def _checkout_failed(self, session, error):
+        if session != self._session:
+            return  # The form has been closed and reopened since.
+        self.error_label.text = str(error) if isinstance(error, (OutOfStockError, ValueError)) else 'Could not save the sale.'
+        self.save_btn.disabled = False
+
+
+class CustomerForm(PopupForm):
+    title = 'Add New Customer'
+    save_text = 'Save Customer'
+    FIELDS = (('name', 'Customer Name'), ('email', 'Email'), ('phone', 'Phone'),
+              ('baby_name', 'Baby Name'), ('baby_age', 'Baby Age'))
+
+    def build_fields(self, layout):
+        self.inputs = {}
+        for field, hint_text in self.FIELDS:
+            self.inputs[field] = ModernTextInput(hint_text=hint_text)
+            layout.add_widget(self.inputs[field])
+
+    def reset(self):
+        for text_input in self.inputs.values():
+            text_input.text = ''
+
+    def save(self):
+        new_customer = {field: text_input.text for field, text_input in self.inputs.items()}
+        if new_customer['name']:
+            self.db_manager.run_async(self.db_manager.add_customer, new_customer)
+            self.dismiss()
+
+
 # --- Navigation Widgets ---
 
-class NavigationCard(ButtonBehavior, BoxLayout):
-    def __init__(self, title, screen_name, **kwargs):
+class LazyScreenManager(ScreenManager):
+    """A ScreenManager that builds registered screens the first time they're needed."""
+    def __init__(self, **kwargs):
+        self.factories = {}
         super().__init__(**kwargs)
-        self.orientation = 'vertical'
-        self.padding = dp(20)
-        self.spacing = dp(15)
+
+    def register(self, name, factory):
+        """Add a screen to be built as factory(name=name) on first use."""
+        self.factories[name] = factory
+
+    def get_screen(self, name):
+        if name in self.factories:
+            self.add_widget(self.factories.pop(name)(name=name))
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        return name in self.factories or super().has_screen(name)
+
+
+class NavigationCard(ButtonBehavior, ModernCard):
+    radius = 20
+    text_padding = dp(20)
+    title_font = (dp(24), (0.1, 0.3, 0.5, 1))
+    halign = 'center'
+    valign = 'middle'
+
+    def __init__(self, title, screen_name, **kwargs):
         # FLEXIBLE: Use size_hint_x to fill grid width
-        self.size_hint = (1, None) 
-        self.height = dp(150)
+        super().__init__(title=title, size_hint=(1, None), height=dp(150), **kwargs)
         self.screen_name = screen_name
-        with self.canvas.before:
-            Color(0.95, 0.95, 0.95, 1)
-            self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[20])
-        self.bind(pos=self.update_rect, size=self.update_rect)
-        self.add_widget(Widget()) 
-        title_label = Label(text=title, font_size=dp(24), bold=True, color=(0.1, 0.3, 0.5, 1))
-        self.add_widget(title_label)
-        self.add_widget(Widget())
-    def update_rect(self, *args):
-        self.rect.pos = self.pos
-        self.rect.size = self.size
+
     def on_press(self):
         App.get_running_app().root.current = self.screen_name
 
@@ -261,8 +2316,13 @@ class NavigationScreen(ResponsiveScreen):
             {'title': 'Dashboard', 'screen_name': 'dashboard'},
             {'title': 'Inventory', 'screen_name': 'inventory'},
             {'title': 'Sales', 'screen_name': 'sales'},
-            {'title': 'Customers', 'screen_name': 'customers'}
+            {'title': 'Customers', 'screen_name': 'customers'},
+            {'title': 'Reports', 'screen_name': 'reports'},
+            {'title': 'Reorder', 'screen_name': 'reorder'},
+            {'title': 'Import / Export', 'screen_name': 'transfer'}
         ]
+        if PROFILE:
+            nav_options.append({'title': 'Profiler', 'screen_name': 'profiler'})
         for option in nav_options:
             card = NavigationCard(title=option['title'], screen_name=option['screen_name'])
             self.grid.add_widget(card)
@@ -272,7 +2332,7 @@ class NavigationScreen(ResponsiveScreen):
 
     def update_layout(self):
         # Switch between 1 and 2 columns based on window width
-        if Window.width < self.breakpoint:
+        if self.is_mobile:
             self.grid.cols = 1
         else:
             self.grid.cols = 2
@@ -285,10 +2345,12 @@ class NavigationScreen(ResponsiveScreen):
 # --- App Screens ---
 
 class DashboardScreen(ResponsiveScreen):
+    watched_tables = ('products', 'customers', 'sales')
+
     def __init__(self, db_manager, **kwargs):
         super().__init__(**kwargs)
         self.db_manager = db_manager
-        self.low_stock_threshold = 5
+        self.db_manager.subscribe(self.on_data_changed)
 
     def build_ui(self):
         main_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
@@ -316,62 +2378,56 @@ class DashboardScreen(ResponsiveScreen):
         self.add_widget(main_layout)
 
     def refresh_data(self):
+        if not self.stats_layout.children:
+            self.activity_layout.add_widget(Label(text='Loading...', color=(0.5, 0.5, 0.5, 1), size_hint_y=None, height=dp(40)))
+        self.db_manager.run_async(self.db_manager.get_dashboard_summary, callback=self.show_summary)
+
+    def show_summary(self, summary):
         self.stats_layout.clear_widgets()
         self.activity_layout.clear_widgets()
 
-        products = self.db_manager.get_all_products()
-        customers = self.db_manager.get_all_customers()
-        sales = self.db_manager.get_all_sales()
+        self.stats_layout.add_widget(ModernCard("Total Items", str(summary['total_products'])))
+        self.stats_layout.add_widget(ModernCard("Total Customers", str(summary['total_customers'])))
+        self.stats_layout.add_widget(ModernCard("Total Revenue", f"${summary['total_revenue']:.2f}"))
+        self.stats_layout.add_widget(ModernCard("Low Stock Alerts", str(summary['low_stock_items'])))
 
-        total_products = len(products)
-        total_customers = len(customers)
-        total_sales = sum(sale['total'] for sale in sales)
-        low_stock_items = len([p for p in products if p['stock'] <= self.low_stock_threshold])
-        
-        self.stats_layout.add_widget(ModernCard("Total Items", str(total_products)))
-        self.stats_layout.add_widget(ModernCard("Total Customers", str(total_customers)))
-        self.stats_layout.add_widget(ModernCard("Total Revenue", f"${total_sales:.2f}"))
-        self.stats_layout.add_widget(ModernCard("Low Stock Alerts", str(low_stock_items)))
-        
-        for sale in sales[:5]:
+        for sale in summary['recent_sales']:
             card = ModernCard(f"Sale #{sale['id']} - {sale['date']}", f"{sale['customer_name']} bought {sale['product_name']} - ${sale['total']:.2f}")
             self.activity_layout.add_widget(card)
     
     def update_layout(self):
         if hasattr(self, 'stats_layout'):
-            if Window.width < self.breakpoint:
+            if self.is_mobile:
                 self.stats_layout.cols = 1
             else:
                 self.stats_layout.cols = 2
 
-# (### NEW / REFACTORED ###) --- INVENTORY WIDGETS ---
-class InventoryEntry(BoxLayout):
-    """A responsive widget for a single inventory item."""
-    def __init__(self, product, **kwargs):
+# --- Inventory Widgets ---
+class InventoryEntry(RecycleDataViewBehavior, BoxLayout):
+    """A responsive, recycled view for a single inventory item.
+
+    Fed {'product': ..., 'screen': ...} by InventoryScreen's list.
+    """
+    def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.product = product
-        self.low_stock_threshold = 2
+        self.product = None
+        self.screen = None
         self.size_hint_y = None
         # Default to horizontal for desktop
         self.orientation = 'horizontal'
         self.spacing = dp(10)
         self.height = dp(140)
 
-        details_text = f"Category: {product['category']}\n" \
-                       f"Age: {product.get('age_range', 'N/A')} | Size: {product['size']}\n" \
-                       f"Condition: {product.get('condition', 'N/A')}"
-        
-        self.card = ModernCard(title=f"{product['name']} - ${product['price']:.2f}", content=details_text)
+        self.card = ModernCard()
         self.card.height = dp(140)
 
-        stock_color = (0.9, 0.3, 0.3, 1) if product['stock'] <= self.low_stock_threshold else (0.2, 0.7, 0.2, 1)
-        stock_status_text = f"Stock: {product['stock']}\n"
-        stock_status_text += "LOW!" if product['stock'] <= self.low_stock_threshold else ""
-        self.status_label = Label(text=stock_status_text, font_size=dp(12), color=stock_color, bold=True, size_hint_x=None, width=dp(80))
+        self.status_label = Label(font_size=dp(12), bold=True, size_hint_x=None, width=dp(80))
         
         self.buttons_layout = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_x=None, width=dp(90))
         self.edit_btn = ModernButton(text='Edit', height=dp(40))
         self.delete_btn = Button(text='Delete', height=dp(40), background_normal='', background_color=(0.9, 0.3, 0.3, 1))
+        self.edit_btn.bind(on_press=lambda x: self.screen.show_edit_product_popup(self.product))
+        self.delete_btn.bind(on_press=lambda x: self.screen.delete_product(self.product))
         self.buttons_layout.add_widget(self.edit_btn)
         self.buttons_layout.add_widget(self.delete_btn)
         
@@ -379,6 +2435,21 @@ class InventoryEntry(BoxLayout):
         self.add_widget(self.status_label)
         self.add_widget(self.buttons_layout)
 
+    def refresh_view_attrs(self, rv, index, data):
+        # Sets self.product and self.screen from data.
+        super().refresh_view_attrs(rv, index, data)
+        product = self.product
+
+        self.card.title = f"{product['name']} - ${product['price']:.2f}"
+        self.card.content = f"Category: {product['category']}\n" \
+                            f"Age: {product.get('age_range', 'N/A')} | Size: {product['size']}\n" \
+                            f"Condition: {product.get('condition', 'N/A')}"
+
+        is_low = product['stock'] <= product['reorder_point']
+        self.status_label.color = (0.9, 0.3, 0.3, 1) if is_low else (0.2, 0.7, 0.2, 1)
+        self.status_label.text = f"Stock: {product['stock']}\n" + ("LOW!" if is_low else "")
+        self.update_orientation(self.screen.is_mobile)
+
     def update_orientation(self, is_mobile):
         if is_mobile:
             # Switch to vertical for mobile
@@ -401,9 +2472,14 @@ class InventoryEntry(BoxLayout):
 
 
 class InventoryScreen(ResponsiveScreen):
+    watched_tables = ('products',)
+
     def __init__(self, db_manager, **kwargs):
         super().__init__(**kwargs)
         self.db_manager = db_manager
+        self.search_text = ''
+        self.db_manager.subscribe(self.on_data_changed)
+        self.product_form = ProductForm(db_manager)
 
     def build_ui(self):
         main_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
@@ -419,30 +2495,51 @@ class InventoryScreen(ResponsiveScreen):
         header_layout.add_widget(add_btn)
         main_layout.add_widget(header_layout)
 
-        scroll = ScrollView()
-        self.products_layout = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None)
-        self.products_layout.bind(minimum_height=self.products_layout.setter('height'))
-        scroll.add_widget(self.products_layout)
-        main_layout.add_widget(scroll)
+        search_input = SearchInput(hint_text='Search name, category, supplier, color, material')
+        search_input.bind(on_search=self.on_search)
+        main_layout.add_widget(search_input)
+
+        self.products_list = PagedList(InventoryEntry, dp(140), self.db_manager.run_async, sort_key=lambda p: (p['name'], p['id']),
+                                       empty_text='No items in inventory.')
+        main_layout.add_widget(self.products_list)
         self.add_widget(main_layout)
+        Clock.schedule_once(self.product_form.prepare, 0.5)
 
     def refresh_data(self):
-        self.products_layout.clear_widgets()
-        products = self.db_manager.get_all_products()
-        for product in products:
-            entry = InventoryEntry(product)
-            entry.edit_btn.bind(on_press=lambda x, p=product: self.show_edit_product_popup(p))
-            entry.delete_btn.bind(on_press=lambda x, p=product: self.delete_product(p))
-            self.products_layout.add_widget(entry)
-        self.update_layout() # Ensure new items have correct layout
+        if self.search_text:
+            text = self.search_text
+            self.products_list.load(lambda after_key, limit: (self.db_manager.search_products(text, limit), None),
+                                    self._product_data)
+        else:
+            self.products_list.load(self.db_manager.get_products_page, self._product_data)
+
+    def on_search(self, search_input, text):
+        self.search_text = text
+        self.refresh_data()
+
+    def _product_data(self, product):
+        return {'product': product, 'screen': self}
+
+    def apply_change(self, event):
+        # Search results are ranked, not name ordered, so rerun the search instead.
+        if event.row_id is None or self.search_text:
+            return False
+        if event.action == 'delete':
+            self.products_list.remove(event.row_id)
+        else:
+            self.db_manager.run_async(self.db_manager.get_product, event.row_id, callback=self._upsert_product)
+        return True
+
+    def _upsert_product(self, product):
+        if product is not None:
+            self.products_list.upsert(product)
 
     def update_layout(self):
-        is_mobile = Window.width < self.breakpoint
-        for child in self.products_layout.children:
-            if isinstance(child, InventoryEntry):
-                child.update_orientation(is_mobile)
+        # Visible entries pick their orientation up again on refresh_from_data.
+        self.products_list.layout.default_size = (None, dp(240) if self.is_mobile else dp(140))
+        self.products_list.view.refresh_from_data()
     
-    # --- Popups and Data Logic (largely unchanged) ---
+    # --- Popups and Data Logic ---
     def show_add_product_popup(self, instance):
         self.show_product_form_popup()
     
@@ -450,87 +2547,21 @@ class InventoryScreen(ResponsiveScreen):
         self.show_product_form_popup(product)
     
     def show_product_form_popup(self, product=None):
-        popup_layout = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
-        title = 'Edit Item' if product else 'Add New Item'
-        
-        name_input = ModernTextInput(hint_text='Product Name')
-        category_spinner = Spinner(text='Select Category', values=['Bodysuits', 'Sleepwear', 'Outerwear', 'Dresses', 'Accessories'], size_hint_y=None, height=dp(40))
-        age_ranges = ['Newborn', '0-3M', '3-6M', '6-9M', '9-12M', '12-18M', '18-24M','3A','Toddler']
-        age_range_spinner = Spinner(text='Select Age Range', values=age_ranges, size_hint_y=None, height=dp(40))
-        price_input = ModernTextInput(hint_text='Price (e.g., 24.99)')
-        stock_input = ModernTextInput(hint_text='Stock Quantity')
-        
-        condition_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(40), spacing=dp(5))
-        condition_label = Label(text='Condition:', color=(0.2,0.2,0.2,1), size_hint_x=0.4)
-        cb_new = CheckBox(group='condition', allow_no_selection=False, active=True, size_hint_x=0.1)
-        cb_used = CheckBox(group='condition', allow_no_selection=False, size_hint_x=0.1)
-        condition_layout.add_widget(condition_label)
-        condition_layout.add_widget(cb_new)
-        condition_layout.add_widget(Label(text='New', color=(0.2,0.2,0.2,1), size_hint_x=0.2))
-        condition_layout.add_widget(cb_used)
-        condition_layout.add_widget(Label(text='Used', color=(0.2,0.2,0.2,1), size_hint_x=0.2))
-
-        if product:
-            name_input.text = product['name']
-            category_spinner.text = product['category']
-            age_range_spinner.text = product.get('age_range', 'Select Age Range')
-            price_input.text = str(product['price'])
-            stock_input.text = str(product['stock'])
-            cb_used.active = product.get('condition') == 'Gently Used'
-
-        popup_layout.add_widget(Label(text=title, font_size=dp(18), bold=True, size_hint_y=None, height=dp(40), color=(0.2,0.2,0.2,1)))
-        popup_layout.add_widget(name_input)
-        popup_layout.add_widget(category_spinner)
-        popup_layout.add_widget(age_range_spinner)
-        popup_layout.add_widget(price_input)
-        popup_layout.add_widget(stock_input)
-        popup_layout.add_widget(condition_layout)
-        
-        buttons_layout = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(50))
-        save_btn = ModernButton(text='Save Item')
-        cancel_btn = Button(text='Cancel', background_normal='', background_color=(0.7, 0.7, 0.7, 1))
-        buttons_layout.add_widget(save_btn)
-        buttons_layout.add_widget(cancel_btn)
-        popup_layout.add_widget(buttons_layout)
-        
-        popup = Popup(title='', content=popup_layout, size_hint=(0.9, 0.9), separator_height=0)
-        
-        def save_product(instance):
-            try:
-                product_data = {
-                    'name': name_input.text, 'category': category_spinner.text, 'price': float(price_input.text),
-                    'stock': int(stock_input.text), 'condition': 'Gently Used' if cb_used.active else 'New',
-                    'age_range': age_range_spinner.text, 'size': age_range_spinner.text,
-                    'color': product.get('color', 'N/A') if product else 'N/A', 
-                    'material': product.get('material', 'N/A') if product else 'N/A',
-                    'supplier': product.get('supplier', 'N/A') if product else 'N/A',
-                }
-                if product:
-                    product_data['id'] = product['id']
-                    self.db_manager.update_product(product_data)
-                else:
-                    self.db_manager.add_product(product_data)
-                
-                self.refresh_data()
-                popup.dismiss()
-            except ValueError:
-                # Add error feedback here if desired
-                pass
-        
-        save_btn.bind(on_press=save_product)
-        cancel_btn.bind(on_press=popup.dismiss)
-        popup.open()
+        self.product_form.open(product)
     
     def delete_product(self, product):
-        self.db_manager.delete_product(product['id'])
-        self.refresh_data()
+        self.db_manager.run_async(self.db_manager.delete_product, product['id'])
 
 
 # SalesScreen and CustomersScreen remain simple and are now responsive via the base class
 class SalesScreen(ResponsiveScreen):
+    watched_tables = ('sales',)
+
     def __init__(self, db_manager, **kwargs):
         super().__init__(**kwargs)
         self.db_manager = db_manager
+        self.db_manager.subscribe(self.on_data_changed)
+        self.sale_form = SaleForm(db_manager)
 
     def build_ui(self):
         main_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
@@ -546,86 +2577,45 @@ class SalesScreen(ResponsiveScreen):
         header_layout.add_widget(add_sale_btn)
         main_layout.add_widget(header_layout)
 
-        scroll = ScrollView()
-        self.sales_layout = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None)
-        self.sales_layout.bind(minimum_height=self.sales_layout.setter('height'))
-        scroll.add_widget(self.sales_layout)
-        main_layout.add_widget(scroll)
+        self.sales_list = PagedList(RecordCard, dp(140), self.db_manager.run_async, sort_key=lambda s: -s['id'],
+                                    empty_text='No sales records found.')
+        main_layout.add_widget(self.sales_list)
         self.add_widget(main_layout)
+        Clock.schedule_once(self.sale_form.prepare, 0.5)
 
     def refresh_data(self):
-        self.sales_layout.clear_widgets()
-        sales = self.db_manager.get_all_sales()
-        if not sales:
-            self.sales_layout.add_widget(Label(text="No sales records found.", color=(0.5,0.5,0.5,1)))
-        for sale in sales:
-            sale_content = f"Customer: {sale['customer_name']}\nProduct: {sale['product_name']} (x{sale['quantity']})\nTotal: ${sale['total']:.2f}"
-            card = ModernCard(title=f"Sale #{sale['id']} - {sale['date']}", content=sale_content)
-            card.height = dp(140)
-            self.sales_layout.add_widget(card)
+        self.sales_list.load(self.db_manager.get_sales_page, self._sale_data)
+
+    def _sale_data(self, sale):
+        sale_content = f"Customer: {sale['customer_name']}\nProduct: {sale['product_name']} (x{sale['quantity']})\nTotal: ${sale['total']:.2f}"
+        return {'title': f"Sale #{sale['id']} - {sale['date']}", 'content': sale_content}
+
+    def apply_change(self, event):
+        if event.row_id is None or event.action == 'delete':
+            return False
+        self.db_manager.run_async(self.db_manager.get_sale, event.row_id, callback=self._upsert_sale)
+        return True
+
+    def _upsert_sale(self, sale):
+        if sale is not None:
+            self.sales_list.upsert(sale)
     
     def update_layout(self):
         pass # No specific layout changes needed for this screen
 
     def show_add_sale_popup(self, instance):
-        # This popup logic remains the same
-        popup_layout = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
-        
-        customers = self.db_manager.get_all_customers()
-        products = self.db_manager.get_all_products()
-        customer_names = [c['name'] for c in customers]
-        product_names = [p['name'] for p in products if p['stock'] > 0]
-
-        customer_spinner = Spinner(text='Select Customer', values=customer_names, size_hint_y=None, height=dp(40))
-        product_spinner = Spinner(text='Select Product', values=product_names, size_hint_y=None, height=dp(40))
-        quantity_input = ModernTextInput(hint_text='Quantity', input_filter='int')
-        date_input = ModernTextInput(hint_text='Date (YYYY-MM-DD)', text=datetime.date.today().isoformat())
-        
-        popup_layout.add_widget(Label(text='Record New Sale', font_size=dp(18), bold=True, size_hint_y=None, height=dp(40), color=(0.2,0.2,0.2,1)))
-        popup_layout.add_widget(date_input)
-        popup_layout.add_widget(customer_spinner)
-        popup_layout.add_widget(product_spinner)
-        popup_layout.add_widget(quantity_input)
-
-        buttons_layout = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(50))
-        save_btn = ModernButton(text='Save Sale')
-        cancel_btn = Button(text='Cancel', background_normal='', background_color=(0.7, 0.7, 0.7, 1))
-        buttons_layout.add_widget(save_btn)
-        buttons_layout.add_widget(cancel_btn)
-        popup_layout.add_widget(buttons_layout)
-
-        popup = Popup(title='', content=popup_layout, size_hint=(0.9, 0.8), separator_height=0)
-
-        def save_sale(instance):
-            try:
-                customer_name = customer_spinner.text
-                product_name = product_spinner.text
-                quantity = int(quantity_input.text)
-                
-                product = next(p for p in products if p['name'] == product_name)
-                customer = next(c for c in customers if c['name'] == customer_name)
-
-                if quantity > product['stock']: return
-
-                new_sale = {
-                    'date': date_input.text, 'customer': customer_name, 'product': product_name, 'quantity': quantity,
-                    'total': quantity * product['price'], 'size': product.get('size', 'N/A')
-                }
-                self.db_manager.add_sale(new_sale, product['id'], customer['id'])
-                self.refresh_data()
-                popup.dismiss()
-            except (ValueError, StopIteration):
-                pass
-        
-        save_btn.bind(on_press=save_sale)
-        cancel_btn.bind(on_press=popup.dismiss)
-        popup.open()
+        self.sale_form.open()
 
 
 class CustomersScreen(ResponsiveScreen):
+    watched_tables = ('customers',)
+
     def __init__(self, db_manager, **kwargs):
         super().__init__(**kwargs)
         self.db_manager = db_manager
+        self.search_text = ''
+        self.db_manager.subscribe(self.on_data_changed)
+        self.customer_form = CustomerForm(db_manager)
 
     def build_ui(self):
         main_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
@@ -640,75 +2630,512 @@ class CustomersScreen(ResponsiveScreen):
         header_layout.add_widget(Widget())
         header_layout.add_widget(add_btn)
         main_layout.add_widget(header_layout)
-        scroll = ScrollView()
-        self.customers_layout = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None)
-        self.customers_layout.bind(minimum_height=self.customers_layout.setter('height'))
-        scroll.add_widget(self.customers_layout)
-        main_layout.add_widget(scroll)
+        search_input = SearchInput(hint_text='Search name, email, phone, baby name')
+        search_input.bind(on_search=self.on_search)
+        main_layout.add_widget(search_input)
+        self.customers_list = PagedList(RecordCard, dp(140), self.db_manager.run_async, sort_key=lambda c: (c['name'], c['id']),
+                                        empty_text='No customers yet.')
+        main_layout.add_widget(self.customers_list)
         self.add_widget(main_layout)
+        Clock.schedule_once(self.customer_form.prepare, 0.5)
 
     def refresh_data(self):
-        self.customers_layout.clear_widgets()
-        customers = self.db_manager.get_all_customers()
-        for customer in customers:
-            customer_content = f"Email: {customer['email']}\nPhone: {customer['phone']}\nBaby: {customer['baby_name']} ({customer['baby_age']})"
-            card = ModernCard(title=f"{customer['name']} - Total Spent: ${customer['total_purchases']:.2f}", content=customer_content)
-            card.height = dp(140)
-            self.customers_layout.add_widget(card)
+        if self.search_text:
+            text = self.search_text
+            self.customers_list.load(lambda after_key, limit: (self.db_manager.search_customers(text, limit), None),
+                                     self._customer_data)
+        else:
+            self.customers_list.load(self.db_manager.get_customers_page, self._customer_data)
+
+    def on_search(self, search_input, text):
+        self.search_text = text
+        self.refresh_data()
+
+    def _customer_data(self, customer):
+        customer_content = f"Email: {customer['email']}\nPhone: {customer['phone']}\nBaby: {customer['baby_name']} ({customer['baby_age']})"
+        return {'title': f"{customer['name']} - Total Spent: ${customer['total_purchases']:.2f}", 'content': customer_content}
+
+    def apply_change(self, event):
+        if event.row_id is None or event.action == 'delete' or self.search_text:
+            return False
+        self.db_manager.run_async(self.db_manager.get_customer, event.row_id, callback=self._upsert_customer)
+        return True
+
+    def _upsert_customer(self, customer):
+        if customer is not None:
+            self.customers_list.upsert(customer)
 
     def update_layout(self):
         pass # No layout changes needed
     
     def show_add_customer_popup(self, instance):
-        # This popup logic remains the same
+        self.customer_form.open()
+
+class BarChart(Widget):
+    """A horizontal bar chart, one row per (label, value_text, fraction).
+
+    Drawn straight onto the canvas: each row is a bar and two text
+    rectangles, kept and reused when set_rows is called again, with texts
+    from a TextureCache. Redrawing a report of the same shape only swaps
+    textures and moves rectangles; resizing only moves them.
+    """
+    row_height = dp(32)
+    row_spacing = dp(6)
+    text_width = dp(110)  # Label and value columns
+    spacing = dp(10)
+    bar_inset = dp(6)
+    bar_color = (0.2, 0.6, 0.8, 1)
+    text_color = (0.2, 0.2, 0.2, 1)
+    font_size = dp(15)
+    textures = TextureCache(512)
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('size_hint_y', None)
+        kwargs.setdefault('height', 0)
+        super().__init__(**kwargs)
+        self.rows = []
+        self._bars = []
+        self._texts = []  # (label rectangle, value rectangle) per row
+        with self.canvas:
+            Color(*self.bar_color)
+            self._bar_group = InstructionGroup()
+            Color(1, 1, 1, 1)
+            self._text_group = InstructionGroup()
+        self.bind(pos=self.update_rects, size=self.update_rects)
+
+    def _texture(self, text):
+        return self.textures.get(f"[size={int(self.font_size)}][color={get_hex_from_color(self.text_color)}]"
+                                 f"{escape_markup(text)}[/color][/size]")
+
+    def set_rows(self, rows):
+        self.rows = rows
+        while len(self._bars) < len(rows):
+            bar, label, value = Rectangle(), Rectangle(), Rectangle()
+            self._bar_group.add(bar)
+            self._text_group.add(label)
+            self._text_group.add(value)
+            self._bars.append(bar)
+            self._texts.append((label, value))
+        while len(self._bars) > len(rows):
+            self._bar_group.remove(self._bars.pop())
+            for rect in self._texts.pop():
+                self._text_group.remove(rect)
+        for (label, value_text, _), (label_rect, value_rect) in zip(rows, self._texts):
+            for rect, text in ((label_rect, label), (value_rect, value_text)):
+                rect.texture = self._texture(text)
+                rect.size = rect.texture.size
+        self.height = len(rows) * (self.row_height + self.row_spacing)
+        self.update_rects()
+
+    def update_rects(self, *args):
+        bar_width = max(self.width - 2 * (self.text_width + self.spacing), 0)
+        for i, ((_, _, fraction), bar, (label_rect, value_rect)) in enumerate(zip(self.rows, self._bars, self._texts)):
+            y = self.top - (i + 1) * self.row_height - i * self.row_spacing
+            bar.pos = (self.x + self.text_width + self.spacing, y + self.bar_inset)
+            bar.size = (bar_width * fraction, self.row_height - 2 * self.bar_inset)
+            for rect, column_x in ((label_rect, self.x), (value_rect, self.right - self.text_width)):
+                width, height = rect.size
+                rect.pos = (int(column_x + (self.text_width - width) / 2), int(y + (self.row_height - height) / 2))
+
+
+class ReportsScreen(ResponsiveScreen):
+    watched_tables = ('sales',)
+
+    def __init__(self, db_manager, **kwargs):
+        super().__init__(**kwargs)
+        self.db_manager = db_manager
+        self.db_manager.subscribe(self.on_data_changed)
+        self.period = 'month'
+
+    def build_ui(self):
+        main_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
+        header_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50), spacing=dp(10))
+        back_btn = ModernButton(text='Back', size_hint_x=None, width=dp(120))
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'navigation'))
+        header_layout.add_widget(back_btn)
+        header_layout.add_widget(Label(text='Reports', font_size=dp(20), bold=True, color=(0.1, 0.3, 0.5, 1)))
+        self.period_buttons = {}
+        for period, text in (('month', 'Monthly'), ('year', 'Yearly')):
+            button = ModernButton(text=text, size_hint_x=None, width=dp(100))
+            button.bind(on_press=lambda x, period=period: self.set_period(period))
+            self.period_buttons[period] = button
+            header_layout.add_widget(button)
+        main_layout.add_widget(header_layout)
+
+        scroll = ScrollView()
+        self.report_layout = BoxLayout(orientation='vertical', spacing=dp(6), size_hint_y=None)
+        self.report_layout.bind(minimum_height=self.report_layout.setter('height'))
+        # Built once; each report only updates their text and rows.
+        self.period_title = Label(font_size=dp(18), bold=True, color=(0.2, 0.2, 0.2, 1), size_hint_y=None, height=dp(40))
+        self.period_chart = BarChart()
+        self.category_title = Label(font_size=dp(18), bold=True, color=(0.2, 0.2, 0.2, 1), size_hint_y=None, height=dp(40))
+        self.category_chart = BarChart()
+        for widget in (self.period_title, self.period_chart, self.category_title, self.category_chart):
+            self.report_layout.add_widget(widget)
+        scroll.add_widget(self.report_layout)
+        main_layout.add_widget(scroll)
+        self.add_widget(main_layout)
+
+    def set_period(self, period):
+        self.period = period
+        self.refresh_data()
+
+    def refresh_data(self):
+        for period, button in self.period_buttons.items():
+            button.disabled = period == self.period
+        self.db_manager.run_async(self.db_manager.get_sales_report, self.period, callback=self.show_report)
+
+    def show_report(self, report):
+        if not report['periods']:
+            self.period_title.text = 'No sales yet.'
+            self.category_title.text = ''
+            self.period_chart.set_rows([])
+            self.category_chart.set_rows([])
+            return
+        self.period_title.text = 'Revenue by ' + self.period
+        self.period_chart.set_rows(self._bar_rows([(row['period'], row['revenue']) for row in report['periods']]))
+        self.category_title.text = 'Revenue by category'
+        self.category_chart.set_rows(self._bar_rows([(row['category'] or 'Uncategorised', row['revenue'])
+                                                     for row in report['categories']]))
+
+    def _bar_rows(self, rows):
+        top = max(revenue for _, revenue in rows) or 1
+        return [(label, f"${revenue:.2f}", revenue / top) for label, revenue in rows]
+
+
+class ReorderScreen(ResponsiveScreen):
+    """Products at or below their reorder point, emptiest first."""
+    watched_tables = ('products',)
+
+    def __init__(self, db_manager, **kwargs):
+        super().__init__(**kwargs)
+        self.db_manager = db_manager
+        self.db_manager.subscribe(self.on_data_changed)
+
+    def build_ui(self):
+        main_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
+        header_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50))
+        back_btn = ModernButton(text='Back', size_hint_x=None, width=dp(120))
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'navigation'))
+        header_label = Label(text='Reorder', font_size=dp(20), bold=True, color=(0.1, 0.3, 0.5, 1))
+        thresholds_btn = ModernButton(text='Thresholds', size_hint_x=None, width=dp(120))
+        thresholds_btn.bind(on_press=self.show_thresholds_popup)
+        header_layout.add_widget(back_btn)
+        header_layout.add_widget(header_label)
+        header_layout.add_widget(Widget())
+        header_layout.add_widget(thresholds_btn)
+        main_layout.add_widget(header_layout)
+
+        self.alerts_list = PagedList(RecordCard, dp(120), self.db_manager.run_async,
+                                     sort_key=lambda p: (p['stock'], p['name'], p['id']),
+                                     empty_text='Nothing needs reordering.')
+        main_layout.add_widget(self.alerts_list)
+        self.add_widget(main_layout)
+
+    def refresh_data(self):
+        self.alerts_list.load(self.db_manager.get_reorder_page, self._alert_data)
+
+    def _alert_data(self, product):
+        return {'title': f"{product['name']} ({product['size']})",
+                'content': f"Stock: {product['stock']} | Reorder at: {product['reorder_point']}\n"
+                           f"Category: {product['category']}\nSupplier: {product['supplier']}"}
+
+    def apply_change(self, event):
+        if event.row_id is None:
+            return False
+        if event.action == 'delete':
+            self.alerts_list.remove(event.row_id)
+        else:
+            self.db_manager.run_async(self.db_manager.get_product, event.row_id, callback=self._update_alert)
+        return True
+
+    def _update_alert(self, product):
+        if product is None:
+            return
+        if product['stock'] <= product['reorder_point']:
+            self.alerts_list.upsert(product)
+        else:
+            self.alerts_list.remove(product['id'])
+
+    def show_thresholds_popup(self, instance):
+        self.db_manager.run_async(self.db_manager.get_category_reorder_points, callback=self._open_thresholds_popup)
+
+    def _open_thresholds_popup(self, reorder_points):
+        from kivy.uix.popup import Popup
         popup_layout = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(20))
-        name_input = ModernTextInput(hint_text='Customer Name')
-        email_input = ModernTextInput(hint_text='Email')
-        phone_input = ModernTextInput(hint_text='Phone')
-        baby_name_input = ModernTextInput(hint_text='Baby Name')
-        baby_age_input = ModernTextInput(hint_text='Baby Age')
-        popup_layout.add_widget(Label(text='Add New Customer', font_size=dp(18), bold=True, size_hint_y=None, height=dp(40), color=(0.2,0.2,0.2,1)))
-        popup_layout.add_widget(name_input)
-        popup_layout.add_widget(email_input)
-        popup_layout.add_widget(phone_input)
-        popup_layout.add_widget(baby_name_input)
-        popup_layout.add_widget(baby_age_input)
+        popup_layout.add_widget(Label(text='Reorder Points by Category', font_size=dp(18), bold=True, size_hint_y=None, height=dp(40), color=(0.2,0.2,0.2,1)))
+        inputs = {}
+        for category, reorder_point in reorder_points.items():
+            row = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(40))
+            row.add_widget(Label(text=category, color=(0.2, 0.2, 0.2, 1)))
+            inputs[category] = ModernTextInput(text='' if reorder_point is None else str(reorder_point), input_filter='int',
+                                               hint_text=f"Default ({self.db_manager.DEFAULT_REORDER_POINT})")
+            row.add_widget(inputs[category])
+            popup_layout.add_widget(row)
+        popup_layout.add_widget(Widget())
+
         buttons_layout = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(50))
-        save_btn = ModernButton(text='Save Customer')
+        save_btn = ModernButton(text='Save')
         cancel_btn = Button(text='Cancel', background_normal='', background_color=(0.7, 0.7, 0.7, 1))
         buttons_layout.add_widget(save_btn)
         buttons_layout.add_widget(cancel_btn)
         popup_layout.add_widget(buttons_layout)
         popup = Popup(title='', content=popup_layout, size_hint=(0.9, 0.9), separator_height=0)
 
-        def save_customer(instance):
-            new_customer = {
-                'name': name_input.text, 'email': email_input.text, 'phone': phone_input.text,
-                'baby_name': baby_name_input.text, 'baby_age': baby_age_input.text
-            }
-            if new_customer['name']:
-                self.db_manager.add_customer(new_customer)
-                self.refresh_data()
-                popup.dismiss()
-        
-        save_btn.bind(on_press=save_customer)
+        def save_thresholds(instance):
+            for category, text_input in inputs.items():
+                reorder_point = int(text_input.text) if text_input.text.strip() else None
+                if reorder_point != reorder_points[category]:
+                    self.db_manager.run_async(self.db_manager.set_category_reorder_point, category, reorder_point)
+            popup.dismiss()
+
+        save_btn.bind(on_press=save_thresholds)
         cancel_btn.bind(on_press=popup.dismiss)
         popup.open()
 
+
+class TransferScreen(ResponsiveScreen):
+    """Import and export tables as CSV or JSON lines files."""
+
+    def __init__(self, db_manager, **kwargs):
+        super().__init__(**kwargs)
+        self.db_manager = db_manager
+        self.transfer = DataTransfer(db_manager)
+        # Transfers get their own thread, so a long import doesn't hold up
+        # the queries the other screens send to the database worker.
+        self.worker = None
+        self.exporting = False
+
+    def build_ui(self):
+        from kivy.uix.spinner import Spinner
+        main_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
+        header_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50))
+        back_btn = ModernButton(text='Back', size_hint_x=None, width=dp(120))
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'navigation'))
+        header_layout.add_widget(back_btn)
+        header_layout.add_widget(Label(text='Import / Export', font_size=dp(20), bold=True, color=(0.1, 0.3, 0.5, 1)))
+        main_layout.add_widget(header_layout)
+
+        self.table_spinner = Spinner(text='products', values=list(DataTransfer.COLUMNS), size_hint_y=None, height=dp(40))
+        self.table_spinner.bind(text=lambda spinner, table: setattr(self.path_input, 'text', self.default_path(table)))
+        self.path_input = ModernTextInput(hint_text='File (.csv or .jsonl)', text=self.default_path('products'))
+        main_layout.add_widget(self.table_spinner)
+        main_layout.add_widget(self.path_input)
+
+        buttons_layout = BoxLayout(orientation='horizontal', spacing=dp(10), size_hint_y=None, height=dp(50))
+        self.import_btn = ModernButton(text='Import')
+        self.export_btn = ModernButton(text='Export')
+        self.import_btn.bind(on_press=lambda x: self.start(self.transfer.import_file))
+        self.export_btn.bind(on_press=lambda x: self.start(self.transfer.export_file))
+        buttons_layout.add_widget(self.import_btn)
+        buttons_layout.add_widget(self.export_btn)
+        main_layout.add_widget(buttons_layout)
+
+        self.status_label = Label(text='', color=(0.2, 0.2, 0.2, 1), size_hint_y=None, height=dp(60))
+        main_layout.add_widget(self.status_label)
+        scroll = ScrollView()
+        self.errors_layout = BoxLayout(orientation='vertical', size_hint_y=None)
+        self.errors_layout.bind(minimum_height=self.errors_layout.setter('height'))
+        scroll.add_widget(self.errors_layout)
+        main_layout.add_widget(scroll)
+        self.add_widget(main_layout)
+
+    def default_path(self, table):
+        # Next to the database file, which is where backups are looked for.
+        return os.path.join(os.path.dirname(os.path.abspath(self.db_manager.db_name)), f'{table}.csv')
+
+    def start(self, operation):
+        if self.worker is None:
+            self.worker = DatabaseWorker(name='data-transfer')
+        self.import_btn.disabled = self.export_btn.disabled = True
+        self.errors_layout.clear_widgets()
+        self.status_label.text = 'Working...'
+        self.exporting = operation == self.transfer.export_file
+        self.worker.submit(operation, self.table_spinner.text, self.path_input.text.strip(), self.show_progress,
+                           callback=self.finished, error_callback=self.failed)
+
+    @mainthread
+    def show_progress(self, progress):
+        if self.exporting:
+            self.status_label.text = f"Exported {progress.rows} {progress.table} rows in {progress.seconds:.1f}s"
+        else:
+            self.status_label.text = (f"Read {progress.rows} {progress.table} rows in {progress.seconds:.1f}s\n"
+                                      f"{progress.inserted} added, {progress.updated} updated, {progress.skipped} skipped")
+
+    def finished(self, result):
+        self.import_btn.disabled = self.export_btn.disabled = False
+        lines = [f"Line {line_number}: {message}" for line_number, message in result.errors]
+        if result.skipped > len(result.errors):
+            lines.append(f"...and {result.skipped - len(result.errors)} more skipped rows")
+        for text in lines:
+            self.errors_layout.add_widget(Label(text=text, color=(0.9, 0.3, 0.3, 1), size_hint_y=None, height=dp(30)))
+
+    def failed(self, error):
+        self.import_btn.disabled = self.export_btn.disabled = False
+        self.status_label.text = f"Failed: {error}"
+
+
+class FrameGraph(Widget):
+    """Recent frame times as a line, with a marker at 60 fps."""
+    scale_ms = 50  # Frame time at the top of the graph
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        with self.canvas:
+            Color(0.95, 0.95, 0.95, 1)
+            self.background = Rectangle()
+            Color(0.2, 0.7, 0.2, 1)
+            self.target_line = Line(width=1)
+            Color(0.9, 0.3, 0.3, 1)
+            self.frames_line = Line(width=1.2)
+        self.bind(pos=self.redraw, size=self.redraw)
+
+    def redraw(self, *args):
+        self.background.pos = self.pos
+        self.background.size = self.size
+        target_y = self.y + self.height * min(1000 / 60 / self.scale_ms, 1)
+        self.target_line.points = [self.x, target_y, self.right, target_y]
+        frames = list(profiler.frame_times)
+        step = self.width / max(profiler.FRAMES - 1, 1)
+        points = []
+        for i, dt in enumerate(frames):
+            points += [self.x + i * step, self.y + self.height * min(dt * 1000 / self.scale_ms, 1)]
+        self.frames_line.points = points
+
+
+class ProfilerScreen(ResponsiveScreen):
+    """Live timings from profiler; only added when STORE_PROFILE=1."""
+    refresh_interval = 1.0
+    COLUMNS = ('Operation', 'Calls', 'SQL/call', 'p50 ms', 'p95 ms', 'Max ms')
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._refresh_event = None
+        self.stat_rows = []  # One list of labels per row of stats, reused every refresh
+
+    def build_ui(self):
+        main_layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(10))
+        header_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50))
+        back_btn = ModernButton(text='Back', size_hint_x=None, width=dp(120))
+        back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'navigation'))
+        reset_btn = ModernButton(text='Reset', size_hint_x=None, width=dp(120))
+        reset_btn.bind(on_press=lambda x: (profiler.reset(), self.refresh_data()))
+        header_layout.add_widget(back_btn)
+        header_layout.add_widget(Label(text='Profiler', font_size=dp(20), bold=True, color=(0.1, 0.3, 0.5, 1)))
+        header_layout.add_widget(reset_btn)
+        main_layout.add_widget(header_layout)
+
+        self.frame_label = Label(text='', color=(0.2, 0.2, 0.2, 1), size_hint_y=None, height=dp(30))
+        self.frame_graph = FrameGraph(size_hint_y=None, height=dp(100))
+        main_layout.add_widget(self.frame_label)
+        main_layout.add_widget(self.frame_graph)
+
+        scroll = ScrollView()
+        self.stats_layout = GridLayout(cols=6, spacing=dp(4), size_hint_y=None, row_default_height=dp(26), row_force_default=True)
+        self.stats_layout.bind(minimum_height=self.stats_layout.setter('height'))
+        for text in self.COLUMNS:
+            self.stats_layout.add_widget(Label(text=text, bold=True, color=(0.1, 0.3, 0.5, 1), font_size=dp(12)))
+        scroll.add_widget(self.stats_layout)
+        main_layout.add_widget(scroll)
+        self.add_widget(main_layout)
+
+    def on_enter(self, *args):
+        super().on_enter(*args)
+        self._dirty = True  # Never cached; always show the latest numbers.
+        if self._refresh_event is not None:
+            self._refresh_event.cancel()
+        self._refresh_event = Clock.schedule_interval(lambda dt: self.refresh_data(), self.refresh_interval)
+
+    def on_pre_leave(self, *args):
+        super().on_pre_leave(*args)
+        # on_pre_leave, not on_leave: an interrupted transition skips the latter.
+        if self._refresh_event is not None:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+
+    def refresh_data(self):
+        frames = sorted(profiler.frame_times)
+        if frames:
+            self.frame_label.text = (f"Frame p50 {percentile(frames, 0.5) * 1000:.1f} ms, "
+                                     f"p95 {percentile(frames, 0.95) * 1000:.1f} ms")
+        self.frame_graph.redraw()
+        stats = profiler.stats()
+        # Labels are only added when there are more operations than rows and
+        # dropped after a reset; otherwise only their text changes.
+        while len(self.stat_rows) < len(stats):
+            row = [Label(color=(0.2, 0.2, 0.2, 1), font_size=dp(12)) for _ in self.COLUMNS]
+            for label in row:
+                self.stats_layout.add_widget(label)
+            self.stat_rows.append(row)
+        while len(self.stat_rows) > len(stats):
+            for label in self.stat_rows.pop():
+                self.stats_layout.remove_widget(label)
+        for row, (name, calls, queries, p50, p95, worst) in zip(self.stat_rows, stats):
+            for label, text in zip(row, (name, str(calls), f'{queries:.1f}', f'{p50:.2f}', f'{p95:.2f}', f'{worst:.2f}')):
+                label.text = text
+
+
 class BabyClothesStoreApp(App):
+    RECONCILE_INTERVAL = 300  # Seconds between incremental customer total checks
+    # Screens behind the navigation grid, built the first time they're opened.
+    SCREENS = {
+        'dashboard': DashboardScreen,
+        'inventory': InventoryScreen,
+        'sales': SalesScreen,
+        'customers': CustomersScreen,
+        'reports': ReportsScreen,
+        'reorder': ReorderScreen,
+        'transfer': TransferScreen,
+    }
+
     def build(self):
+        # Only what the first frame shows is built here. The database's
+        # schema checks and seeding wait until that frame is on screen.
+        self.startup_times = {'imports': self._since_launch()}
         self.title = 'Store Management System'
         Window.clearcolor = (1, 1, 1, 1)
-        self.db_manager = DatabaseManager()
+        self.db_manager = DatabaseManager(setup=False)
 
-        sm = ScreenManager(transition=FadeTransition(duration=0.2))
+        sm = LazyScreenManager(transition=FadeTransition(duration=0.2))
         sm.add_widget(NavigationScreen(name='navigation'))
-        sm.add_widget(DashboardScreen(self.db_manager, name='dashboard'))
-        sm.add_widget(InventoryScreen(self.db_manager, name='inventory'))
-        sm.add_widget(SalesScreen(self.db_manager, name='sales'))
-        sm.add_widget(CustomersScreen(self.db_manager, name='customers'))
+        for name, screen_class in self.SCREENS.items():
+            sm.register(name, functools.partial(screen_class, self.db_manager))
+        if PROFILE:
+            sm.register('profiler', ProfilerScreen)
+            Clock.schedule_interval(profiler.record_frame, 0)
         sm.current = 'navigation'
+
+        Window.bind(on_flip=self.on_first_frame)
+        self.startup_times['build'] = self._since_launch()
         return sm
 
+    @staticmethod
+    def _since_launch():
+        return (time.perf_counter() - LAUNCH_TIME) * 1000
+
+    def on_first_frame(self, window):
+        window.unbind(on_flip=self.on_first_frame)
+        self.startup_times['first_frame'] = self._since_launch()
+        self.db_manager.setup_async(callback=self.on_database_ready)
+
+    def on_database_ready(self, result):
+        self.startup_times['database_ready'] = self._since_launch()
+        if PROFILE:
+            for stage, ms in self.startup_times.items():
+                profiler.record(f'startup.{stage}', ms / 1000)
+            print('Startup (ms since launch): ' + ', '.join(f'{stage} {ms:.0f}' for stage, ms in self.startup_times.items()))
+        # One full check of customer totals per launch, then cheap
+        # incremental passes on the worker while the app is open.
+        self.db_manager.start_full_verify()
+        Clock.schedule_interval(self.reconcile_customer_totals, self.RECONCILE_INTERVAL)
+
+    def reconcile_customer_totals(self, dt):
+        self.db_manager.run_async(self.db_manager.reconcile_customer_totals)
+
+    def on_stop(self):
+        self.db_manager.close()
+        if PROFILE:
+            print(profiler.report())
+
 if __name__ == '__main__':
     BabyClothesStoreApp().run()
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""Cards rendered per second and canvas instructions per card, ModernCard
+against the earlier two-Label implementation.
+
+"Before" is a copy of the old ModernCard: a BoxLayout holding a title and a
+content Label, whose text_size is reset on every move or resize. "After" is
+baby.ModernCard. Each builds --cards cards under a headless window, then
+resizes them --resizes times between two widths. Once both widths of
+every card fit in ModernCard.TEXTURE_CACHE_SIZE, resizes stop rendering.
+
+    python benchmarks/bench_cards.py [--cards 500] [--resizes 20]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.config import Config  # noqa: E402
+logging.getLogger('kivy').addHandler(logging.NullHandler())
+logging.getLogger('kivy').propagate = False
+Config.set('graphics', 'maxfps', '0')
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.graphics import Color, InstructionGroup, RoundedRectangle  # noqa: E402
+from kivy.metrics import dp  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.gridlayout import GridLayout  # noqa: E402
+from kivy.uix.label import Label  # noqa: E402
+
+import baby  # noqa: E402
+
+WIDTHS = (dp(360), dp(720))
+
+
+class LegacyCard(BoxLayout):
+    # The ModernCard this benchmark replaced.
+    def __init__(self, title="", content="", **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.padding = dp(15)
+        self.spacing = dp(10)
+        self.size_hint_y = None
+        self.height = dp(120)
+        with self.canvas.before:
+            Color(0.95, 0.95, 0.95, 1)
+            self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[15])
+        self.bind(pos=self.update_rect, size=self.update_rect)
+        self.title_label = Label(text=title, font_size=dp(16), bold=True, color=(0.2, 0.2, 0.2, 1), size_hint_y=0.4,
+                                 text_size=(self.width - dp(30), None), halign='left', valign='top')
+        self.add_widget(self.title_label)
+        self.content_label = Label(text=content, font_size=dp(14), color=(0.4, 0.4, 0.4, 1), size_hint_y=0.6,
+                                   text_size=(self.width - dp(30), None), halign='left', valign='top')
+        self.add_widget(self.content_label)
+
+    def update_rect(self, *args):
+        self.rect.pos = self.pos
+        self.rect.size = self.size
+        self.title_label.text_size = (self.width - dp(30), None)
+        self.content_label.text_size = (self.width - dp(30), None)
+
+
+def count_instructions(group):
+    """Drawing instructions under a canvas, not counting the groups holding them."""
+    return sum(count_instructions(child) if isinstance(child, InstructionGroup) else 1 for child in group.children)
+
+
+def frames(n=2):
+    for _ in range(n):
+        EventLoop.idle()
+
+
+def run(label, card_class, cards, resizes):
+    grid = GridLayout(cols=1, size_hint=(None, None), width=WIDTHS[0], spacing=dp(10))
+    grid.bind(minimum_height=grid.setter('height'))
+    Window.add_widget(grid)
+    try:
+        start = time.perf_counter()
+        for i in range(cards):
+            grid.add_widget(card_class(f"Sale #{i} - 2024-06-{1 + i % 28:02d}",
+                                       f"Customer {i % 97}\nProduct {i} (x{1 + i % 3})\nTotal: ${i * 1.25:.2f}"))
+        frames()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(resizes):
+            grid.width = WIDTHS[(i + 1) % 2]
+            frames()
+        resize = time.perf_counter() - start
+        instructions = count_instructions(grid.children[0].canvas)
+    finally:
+        Window.remove_widget(grid)
+    print(f"{label:<8} {cards / build:>9.0f} cards/s built  {resizes / resize:>7.1f} resizes/s "
+          f"({resize / resizes * 1000:.1f} ms for {cards} cards)  {instructions} instructions/card")
+    return cards / build, resizes / resize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=500)
+    parser.add_argument('--resizes', type=int, default=20)
+    args = parser.parse_args()
+    frames()
+    before = run('before', LegacyCard, args.cards, args.resizes)
+    after = run('after', baby.ModernCard, args.cards, args.resizes)
+    print(f"speedup: {after[0] / before[0]:.1f}x cards/s, {after[1] / before[1]:.1f}x resizes/s")
+
+
+if __name__ == '__main__':
+    main()
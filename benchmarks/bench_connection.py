@@ -0,0 +1,91 @@
+"""Statements/second for DatabaseManager._execute, before and after the
+persistent connection layer.
+
+"Before" replays the old reconnect-per-statement pattern; "after" goes
+through DatabaseManager on the same store.db seeded with 100k sales.
+
+    python benchmarks/bench_connection.py [--sales 100000] [--statements 2000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baby import DatabaseManager  # noqa: E402
+
+
+def seed_sales(db, count):
+    products = db.get_all_products()
+    customers = db.get_all_customers()
+    rows = []
+    for i in range(count):
+        product = random.choice(products)
+        customer = random.choice(customers)
+        quantity = random.randint(1, 3)
+        rows.append((f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}", customer['name'], product['name'],
+                     quantity, quantity * product['price'], product['size']))
+    with db.transaction():
+        db._executemany('INSERT INTO sales (date, customer_name, product_name, quantity, total, size) VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+
+def workload(db):
+    """The statements a dashboard refresh followed by a sale issues."""
+    product = random.choice(db.get_all_products())
+    return [
+        ('SELECT * FROM products ORDER BY name', ()),
+        ('SELECT * FROM customers ORDER BY name', ()),
+        ('SELECT * FROM sales ORDER BY id DESC LIMIT 5', ()),
+        ('SELECT COUNT(*) FROM sales', ()),
+        ('UPDATE products SET stock = stock WHERE id = ?', (product['id'],)),
+    ]
+
+
+def reconnect_execute(db_name, query, params=()):
+    # The pre-pooling DatabaseManager._execute.
+    with sqlite3.connect(db_name) as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        conn.commit()
+    conn.close()
+    return rows
+
+
+def run(label, execute, statements, count):
+    start = time.perf_counter()
+    for i in range(count):
+        query, params = statements[i % len(statements)]
+        execute(query, params)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {count / elapsed:>10.0f} statements/s  ({elapsed:.2f}s)")
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sales', type=int, default=100000)
+    parser.add_argument('--statements', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, 'store.db')
+        db = DatabaseManager(db_name)
+        seed_sales(db, args.sales)
+        statements = workload(db)
+
+        before = run('reconnect per statement', lambda q, p: reconnect_execute(db_name, q, p),
+                     statements, args.statements)
+        after = run('persistent connection', lambda q, p: db._execute(q, p).fetchall(),
+                    statements, args.statements)
+        print(f"speedup: {after / before:.1f}x")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""Benchmark suite for DatabaseManager queries and screen refreshes.
+
+Builds synthetic stores of each size (that many products and sales, a
+tenth as many customers), times the database calls and every screen's
+refresh_data under a headless Kivy window, and writes a JSON report.
+Exits non-zero if a screen timing is over its budget (SCREEN_BUDGETS_MS,
+times --budget-scale on slower machines). Pass an earlier report as
+--compare to also flag regressions against it.
+
+    python benchmarks/bench_suite.py [--sizes 1000 10000 100000] [--repeat 5]
+                                     [--output report.json] [--compare old.json]
+                                     [--budget-scale 1.0]
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+# Log through the logging module instead of letting Kivy take over stderr,
+# so a failing benchmark still prints its traceback.
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import kivy  # noqa: E402
+from kivy.config import Config  # noqa: E402
+# Kivy warns about missing optional input and clipboard providers at import;
+# keep that out of the report output.
+logging.getLogger('kivy').addHandler(logging.NullHandler())
+logging.getLogger('kivy').propagate = False
+# Don't let the Clock sleep to hold 60 fps, or refresh timings are rounded
+# up to whole frames.
+Config.set('graphics', 'maxfps', '0')
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.uix.screenmanager import ScreenManager, NoTransition  # noqa: E402
+
+import baby  # noqa: E402
+
+CATEGORIES = ('Bodysuits', 'Sleepwear', 'Outerwear', 'Dresses', 'Accessories')
+SIZES = ('Newborn', '0-3M', '3-6M', '6-9M', '9-12M', '12-18M')
+SCREEN_TIMEOUT = 30  # Seconds to wait for a screen's data before giving up
+# Median ms allowed for each screen timing at every store size. A refresh
+# includes its database round-trip; render_reports is drawing an already
+# fetched report. Reports aggregate the whole sales_daily rollup, which
+# is about 100k rows in the largest store.
+SCREEN_BUDGETS_MS = {
+    'refresh_dashboard': 50,
+    'refresh_inventory': 50,
+    'refresh_sales': 50,
+    'refresh_customers': 50,
+    'refresh_reports': 150,
+    'render_reports': 20,
+    'refresh_reorder': 50,
+}
+
+
+def build_store(db_name, size, seed=1):
+    """A DatabaseManager on db_name holding size products and sales."""
+    rng = random.Random(seed)
+    db = baby.DatabaseManager(db_name)
+    products = [(f"Product {i}", rng.choice(CATEGORIES), round(rng.uniform(5, 60), 2), rng.randint(0, 500),
+                 f"Supplier {i % 50}", size_name, size_name, 'White', 'Cotton', 'New')
+                for i, size_name in ((i, rng.choice(SIZES)) for i in range(size))]
+    product_ids = db.bulk_add_products(products)
+    customer_ids = db.bulk_add_customers([(f"Customer {i}", f"customer{i}@example.com", f"555-{i:07d}", 0, '', '')
+                                          for i in range(max(size // 10, 1))])
+    prices = {product_id: row for product_id, row in zip(product_ids, products)}
+    start = datetime.date(2020, 1, 1)
+    sales = []
+    for _ in range(size):
+        product_id = rng.choice(product_ids)
+        name, _, price, _, _, size_name = prices[product_id][:6]
+        quantity = rng.randint(1, 3)
+        sales.append(({'date': (start + datetime.timedelta(days=rng.randint(0, 1800))).isoformat(),
+                       'customer': '', 'product': name, 'quantity': quantity,
+                       'total': quantity * price, 'size': size_name}, product_id, rng.choice(customer_ids)))
+    db.bulk_add_sales(sales)
+    return db
+
+
+def time_calls(func, repeat):
+    """Run func once to warm up, then repeat times; return timings in ms."""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings):
+    return {'median_ms': round(statistics.median(timings), 3), 'min_ms': round(min(timings), 3),
+            'max_ms': round(max(timings), 3), 'runs': len(timings)}
+
+
+def database_benchmarks(db):
+    product = db.get_all_products()[0]
+    customer = db.get_all_customers()[0]
+    sale = {'date': '2024-01-01', 'customer': customer['name'], 'product': product['name'],
+            'quantity': 1, 'total': product['price'], 'size': product['size']}
+    db._execute('UPDATE products SET stock = stock + 1000000 WHERE id = ?', (product['id'],))
+    return {
+        'get_all_products': lambda: db.get_all_products(),
+        'get_all_customers': lambda: db.get_all_customers(),
+        'get_all_sales': lambda: db.get_all_sales(),
+        'get_products_page': lambda: db.get_products_page(),
+        'get_dashboard_summary': lambda: db.get_dashboard_summary(),
+        'get_sales_report': lambda: db.get_sales_report('month'),
+        'search_products': lambda: db.search_products('prod'),
+        'add_sale': lambda: db.add_sale(sale, product['id'], customer['id']),
+        'checkout': lambda: db.checkout(customer['id'], [(product['id'], 1)], '2024-01-01'),
+    }
+
+
+def pump_until(done, timeout=SCREEN_TIMEOUT):
+    deadline = time.perf_counter() + timeout
+    while not done():
+        if time.perf_counter() > deadline:
+            raise TimeoutError('screen did not finish loading')
+        EventLoop.idle()
+
+
+def screen_benchmarks(db, repeat):
+    """Time refresh_data for each screen until its data is on screen."""
+    manager = ScreenManager(transition=NoTransition())
+    screens = {
+        'dashboard': baby.DashboardScreen(db, name='dashboard'),
+        'inventory': baby.InventoryScreen(db, name='inventory'),
+        'sales': baby.SalesScreen(db, name='sales'),
+        'customers': baby.CustomersScreen(db, name='customers'),
+        'reports': baby.ReportsScreen(db, name='reports'),
+        'reorder': baby.ReorderScreen(db, name='reorder'),
+    }
+    # Each screen is done once its list has its first page, or once the
+    # summary / report callback has run. Hooked before the screens are added,
+    # since adding the first one enters it.
+    finished = []
+    for screen, method in ((screens['dashboard'], 'show_summary'), (screens['reports'], 'show_report')):
+        original = getattr(screen, method)
+        setattr(screen, method, lambda result, original=original: (original(result), finished.append(True)))
+    for screen in screens.values():
+        manager.add_widget(screen)
+    Window.add_widget(manager)
+    lists = {'inventory': 'products_list', 'sales': 'sales_list', 'customers': 'customers_list', 'reorder': 'alerts_list'}
+
+    results = {}
+    try:
+        for name, screen in screens.items():
+            manager.current = name
+            if name in lists:
+                # The list only exists once entering the screen has built it.
+                paged = lambda: getattr(screen, lists[name], None)
+                done = lambda: paged() is not None and not paged().loading
+            else:
+                done = lambda: bool(finished)
+            pump_until(done)  # First entry builds the UI and loads once.
+
+            def refresh():
+                finished.clear()
+                screen.refresh_data()
+                pump_until(done)
+            results[f'refresh_{name}'] = summarize(time_calls(refresh, repeat))
+
+        # Drawing a report apart from fetching it, so a slow chart can't
+        # hide behind the query time.
+        reports = screens['reports']
+        report = db.get_sales_report(reports.period)
+
+        def render():
+            reports.show_report(report)
+            EventLoop.idle()
+        results['render_reports'] = summarize(time_calls(render, repeat))
+    finally:
+        Window.remove_widget(manager)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(report, baseline, threshold):
+    """Print each timing against baseline; return the names that regressed."""
+    regressions = []
+    for size, results in report['results'].items():
+        for name, result in results.items():
+            before = baseline.get('results', {}).get(size, {}).get(name)
+            if before is None:
+                continue
+            ratio = result['median_ms'] / max(before['median_ms'], 1e-6)
+            flag = '  REGRESSION' if ratio > threshold else ''
+            print(f"{size:>7} {name:<24} {before['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms  {ratio:5.2f}x{flag}")
+            if flag:
+                regressions.append(f'{size}/{name}')
+    return regressions
+
+
+def over_budget(report, scale):
+    """Print each screen timing over its budget; return their names."""
+    failures = []
+    for size, results in report['results'].items():
+        for name, budget in SCREEN_BUDGETS_MS.items():
+            result = results.get(name)
+            if result is not None and result['median_ms'] > budget * scale:
+                print(f"{size:>7} {name:<24} {result['median_ms']:>10.3f} ms  OVER BUDGET ({budget * scale:g} ms)")
+                failures.append(f'{size}/{name}')
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='benchmark-report.json')
+    parser.add_argument('--compare', help='earlier report to check against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='median slowdown ratio counted as a regression (default 1.25)')
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help='multiply every screen budget, for slower machines (default 1.0)')
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'kivy': kivy.__version__,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            start = time.perf_counter()
+            db = build_store(os.path.join(tmp, f'store-{size}.db'), size)
+            print(f"{size} rows: store built in {time.perf_counter() - start:.1f}s")
+            results = {name: summarize(time_calls(func, args.repeat))
+                       for name, func in database_benchmarks(db).items()}
+            results.update(screen_benchmarks(db, args.repeat))
+            for name, result in results.items():
+                print(f"  {name:<24} {result['median_ms']:>10.3f} ms")
+            report['results'][str(size)] = results
+            db.close()
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.output}")
+
+    failed = False
+    over = over_budget(report, args.budget_scale)
+    if over:
+        print(f"{len(over)} over budget: {', '.join(over)}")
+        failed = True
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Import-time profile of `import baby`, from `python -X importtime`.
+
+Imports baby in a fresh interpreter a few times, keeps each module's best
+run, and prints the total and the slowest modules by their own import
+time. Fails if a module that baby should only load on demand (see
+DEFERRED) was imported at startup, or if --budget is given and the total
+is over it.
+
+    python benchmarks/import_profile.py [--runs 5] [--top 25] [--budget 400]
+                                        [--output import-profile.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Only imported inside the methods that build popups and forms.
+DEFERRED = ('kivy.uix.popup', 'kivy.uix.spinner', 'kivy.uix.checkbox', 'kivy.uix.dropdown')
+
+
+def profile_once():
+    """{module: (self_us, cumulative_us)} for one `import baby`."""
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    env.setdefault('SDL_VIDEODRIVER', 'offscreen')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import baby'],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode:
+        sys.exit(f"import baby failed:\n{result.stderr}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def profile(runs):
+    """Each module's fastest (self_us, cumulative_us) over runs imports."""
+    best = {}
+    for _ in range(runs):
+        for name, times in profile_once().items():
+            best[name] = min(best.get(name, times), times)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--budget', type=float, help='fail if importing baby takes longer (ms)')
+    parser.add_argument('--output', help='also write the profile as JSON')
+    args = parser.parse_args()
+
+    modules = profile(args.runs)
+    total_ms = modules['baby'][1] / 1000
+    print(f"import baby: {total_ms:.1f} ms cumulative, {len(modules)} modules (best of {args.runs})")
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}  {name}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'total_ms': total_ms, 'runs': args.runs,
+                       'modules': {name: {'self_us': s, 'cumulative_us': c} for name, (s, c) in modules.items()}},
+                      f, indent=2)
+        print(f"profile written to {args.output}")
+
+    failures = [f"{name} is imported at startup" for name in DEFERRED if name in modules]
+    if args.budget is not None and total_ms > args.budget:
+        failures.append(f"import baby took {total_ms:.1f} ms, over the {args.budget:g} ms budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
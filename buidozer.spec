@@ -23,6 +23,7 @@ source.include_patterns = images/*.png
 
 # (list) List of directory to exclude (let empty to not exclude anything)
 #source.exclude_dirs = tests, bin, venv
+source.exclude_dirs = benchmarks
 
 # (list) List of exclusions using pattern matching
 # Do not prefix with './'